@@ -1,65 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import struct
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
 import dearpygui.dearpygui as dpg  # type: ignore
 import numpy as np
-import usb.core
-import usb.util
 from node_editor.util import dpg_set_value, get_tag_name_list  # type: ignore
 
+from node.input_node.respeaker_v2.device import DEVICE_PROBE  # type: ignore
+from node.input_node.respeaker_v2.engine import SHARED_ENGINE  # type: ignore
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
 from node.node_abc import DpgNodeABC  # type: ignore
 
 
-# ReSpeaker parameter definitions
-PARAMETERS = {
-    'DOAANGLE': (21, 0, 'int', 359, 0, 'ro', 'DOA angle. Current value. Orientation depends on build configuration.')
-}
-
-
-class Tuning:
-    TIMEOUT = 100000
-
-    def __init__(self, dev):
-        self.dev = dev
-
-    def read(self, name):
-        try:
-            data = PARAMETERS[name]
-        except KeyError:
-            return
-
-        id = data[0]
-
-        cmd = 0x80 | data[1]
-        if data[2] == 'int':
-            cmd |= 0x40
-
-        length = 8
-
-        response = self.dev.ctrl_transfer(
-            usb.util.CTRL_IN | usb.util.CTRL_TYPE_VENDOR | usb.util.CTRL_RECIPIENT_DEVICE,
-            0, cmd, id, length, self.TIMEOUT)
-
-        response = struct.unpack(b'ii', response.tobytes())
-
-        if data[2] == 'int':
-            result = response[0]
-        else:
-            result = response[0] * (2.**response[1])
-
-        return result
-
-    @property
-    def direction(self):
-        return self.read('DOAANGLE')
-
-    def close(self):
-        usb.util.dispose_resources(self.dev)
-
-
 class Node(DpgNodeABC):
     _ver: str = "0.0.1"
 
@@ -70,15 +23,8 @@ class Node(DpgNodeABC):
         self._node_data = {}
         self._add_node_flag = False  # 単一ノード制御フラグ
 
-        # USB経由でReSpeakerデバイスを取得（DOA用）
-        self._respeaker_device = None
-        try:
-            dev = usb.core.find(idVendor=0x2886, idProduct=0x0018)
-            if dev:
-                self._respeaker_device = Tuning(dev)
-        except Exception as e:
-            print(f"Failed to initialize ReSpeaker USB device: {e}")
-            self._respeaker_device = None
+        # DOAのUSBポーリングは共有キャプチャエンジンが担当（ノード追加時に開始）
+        self._respeaker_connected = False
 
     def add_node(
         self,
@@ -91,6 +37,12 @@ class Node(DpgNodeABC):
         if self._add_node_flag:
             return None
         self._add_node_flag = True
+
+        # USB経由でReSpeakerデバイスを取得（3ノード共通のキャッシュを使用）
+        self._respeaker_connected = DEVICE_PROBE.get().usb_device is not None
+        DEVICE_PROBE.start_background_refresh()
+        SHARED_ENGINE.start_polling()
+
         # タグ名
         tag_name_list: List[Any] = get_tag_name_list(
             node_id,
@@ -108,6 +60,8 @@ class Node(DpgNodeABC):
         # 設定
         self._setting_dict = setting_dict or {}
         self._use_pref_counter: bool = self._setting_dict["use_pref_counter"]
+        if self._setting_dict.get("use_respeaker_trace", False):
+            TRACER.enabled = True
 
         self._node_data[str(node_id)] = {
             "doa": 0,
@@ -126,7 +80,7 @@ class Node(DpgNodeABC):
                 tag=f"{node_id}:status_attr",
                 attribute_type=dpg.mvNode_Attr_Static,
             ):
-                if self._respeaker_device is not None:
+                if self._respeaker_connected:
                     dpg.add_text("ReSpeaker v2: Connected", color=(0, 255, 0))
                 else:
                     dpg.add_text("ReSpeaker v2: Not Found", color=(255, 0, 0))
@@ -175,6 +129,7 @@ class Node(DpgNodeABC):
         # 計測開始
         if self._use_pref_counter:
             start_time = time.perf_counter()
+        update_trace_start = TRACER.begin()
 
         current_status = player_status_dict.get("current_status", False)
         
@@ -184,13 +139,11 @@ class Node(DpgNodeABC):
             if current_time - self._node_data[str(node_id)]["last_update_time"] >= 0.1:
                 self._node_data[str(node_id)]["last_update_time"] = current_time
                 
-                if self._respeaker_device is not None:
-                    try:
-                        doa = self._respeaker_device.direction
-                        self._node_data[str(node_id)]["doa"] = doa
-                        dpg_set_value(output_tag_list[0][1], f"DOA: {doa}°")
-                    except Exception as e:
-                        pass
+                # 共有キャプチャエンジンがポーリングした最新値を表示
+                doa = SHARED_ENGINE.doa
+                if doa is not None:
+                    self._node_data[str(node_id)]["doa"] = doa
+                    dpg_set_value(output_tag_list[0][1], f"DOA: {doa}°")
             # 更新間隔内では前回の値を維持（何もしない）
 
         result_dict = {
@@ -198,6 +151,7 @@ class Node(DpgNodeABC):
         }
 
         # 計測終了
+        TRACER.end("doa.update", update_trace_start)
         if self._use_pref_counter:
             elapsed_time = time.perf_counter() - start_time
             elapsed_time = int(elapsed_time * 1000)
@@ -206,6 +160,9 @@ class Node(DpgNodeABC):
         return result_dict
 
     def close(self, node_id: str) -> None:
+        if self._add_node_flag:
+            SHARED_ENGINE.stop_polling()
+            DEVICE_PROBE.stop_background_refresh()
         self._add_node_flag = False
 
     def get_setting_dict(self, node_id: str) -> Dict[str, Any]:
@@ -1,14 +1,43 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import dearpygui.dearpygui as dpg  # type: ignore
 import numpy as np
-import sounddevice as sd  # type: ignore
+from node.input_node.respeaker_v2.analysis_pool import (  # type: ignore
+    AnalysisResult,
+    ChunkAnalysisPool,
+)
+from node.input_node.respeaker_v2.beamformer import Beamformer  # type: ignore
+from node.input_node.respeaker_v2.device import (  # type: ignore
+    DEVICE_PROBE,
+    DEVICE_STATE,
+)
+from node.input_node.respeaker_v2.echo_canceller import (  # type: ignore
+    EchoCanceller,
+    fit_block_size,
+)
+from node.input_node.respeaker_v2.engine import SHARED_ENGINE  # type: ignore
+from node.input_node.respeaker_v2.level_meter import (  # type: ignore
+    LevelMeter,
+    level_to_ratio,
+)
+from node.input_node.respeaker_v2.spectrogram import (  # type: ignore
+    ScrollingSpectrogram,
+)
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
 from node.node_abc import DpgNodeABC  # type: ignore
 from node_editor.util import dpg_set_value, get_tag_name_list  # type: ignore
 
+# ビームフォーマの手法名と Beamformer.method の対応
+BEAMFORMER_METHODS: Dict[str, Optional[str]] = {
+    "Beam: Off": None,
+    "Beam: Delay-and-Sum": "das",
+    "Beam: MVDR": "mvdr",
+}
+
 
 class Node(DpgNodeABC):
     _ver: str = "0.0.1"
@@ -16,26 +45,26 @@ class Node(DpgNodeABC):
     node_label: str = "ReSpeaker v2 Mic"
     node_tag: str = "ReSpeakerV2Mic"
 
-    # クラス変数として共有ストリームを管理
-    _respeaker_sd = None
-    _respeaker_buffer = None
+    # クラス変数として共有チャンクを管理（ストリームは共有キャプチャエンジンが保持）
     _shared_node_count = 0
     _shared_chunks = [np.array([]) for _ in range(6)]
+    _shared_block = np.zeros((0, 6), dtype=np.float32)
+    _shared_read_pos = 0
     _shared_chunk_updated = False
     _processed_node_count = 0
+    # チャンク取り出しを担当するノード（閉じられた場合は次に更新したノードが引き継ぐ）
+    _master_node_id: Optional[str] = None
+    # レベル/スペクトル/DOA推定をワーカースレッドで計算するプール（全ノード共通）
+    _analysis_pool: Optional[ChunkAnalysisPool] = None
+    # ノード毎の解析要求（レベル, スペクトルのチャンネル, DOA推定）
+    _analysis_requests: Dict[str, Tuple[bool, Optional[int], bool]] = {}
 
     def __init__(self) -> None:
         self._node_data = {}
 
-        # ReSpeakerオーディオデバイスを探す
+        # ReSpeakerオーディオデバイスの探索はノード追加時まで遅延
         self._respeaker_input_id = None
 
-        # デバイスリストからReSpeakerを探す
-        for input_id, device in enumerate(sd.query_devices()):
-            if device["max_input_channels"] >= 6 and "ReSpeaker" in device["name"]:
-                self._respeaker_input_id = input_id
-                break
-
     def add_node(
         self,
         parent: str,
@@ -58,6 +87,10 @@ class Node(DpgNodeABC):
         input_tag_list = tag_name_list[1]
         output_tag_list = tag_name_list[2]
 
+        # ReSpeakerオーディオデバイスを探す（3ノード共通のキャッシュを使用）
+        # USBデバイスの定期再探索はUSBハンドルを使うVAD/DOAノードのみが行う
+        self._respeaker_input_id = DEVICE_PROBE.get().input_id
+
         # 設定
         self._setting_dict = setting_dict or {}
         waveform_w: int = self._setting_dict.get("waveform_width", 200)
@@ -67,18 +100,97 @@ class Node(DpgNodeABC):
         )
         self._chunk_size: int = self._setting_dict.get("chunk_size", 1024)
         self._use_pref_counter: bool = self._setting_dict["use_pref_counter"]
+        self._meter_floor_db: float = self._setting_dict.get("meter_floor_db", -60.0)
+
+        # ハードウェアブロックサイズ/レイテンシ（チャンクサイズとは独立）
+        # 既定は従来動作と同じ "default"、低レイテンシは "low_latency" を指定した場合のみ
+        self._latency_mode: str = self._setting_dict.get(
+            "respeaker_latency_mode", "default"
+        )
+        self._blocksize: Optional[int] = self._setting_dict.get("respeaker_blocksize")
+        self._latency: Any = self._setting_dict.get("respeaker_latency")
+        self._ring_seconds: float = self._setting_dict.get(
+            "respeaker_ring_seconds", 2.0
+        )
+
+        # ソフトウェアAEC設定
+        self._aec_block_size: int = fit_block_size(
+            self._chunk_size, self._setting_dict.get("aec_block_size", 256)
+        )
+        self._aec_num_partitions: int = self._setting_dict.get(
+            "aec_num_partitions", 8
+        )
+
+        # オーバーラップフレーム出力の既定値
+        frame_length: int = self._setting_dict.get("frame_length", 512)
+        hop_size: int = self._setting_dict.get("hop_size", 256)
+
+        # ソフトウェアビームフォーマ設定
+        self._beam_hop_size: int = fit_block_size(
+            self._chunk_size, self._setting_dict.get("beam_hop_size", 256)
+        )
+        self._beam_doa_offset: float = self._setting_dict.get("beam_doa_offset", 0.0)
+
+        # ステージ毎の計測スパン（3ノード共通のトレーサー）
+        if self._setting_dict.get("use_respeaker_trace", False):
+            TRACER.enabled = True
+        self._trace_export_dir: str = self._setting_dict.get(
+            "respeaker_trace_dir", "."
+        )
+
+        # チャンク毎の派生データ（レベル/スペクトル/DOA推定）をワーカースレッドで計算
+        spectrogram_fft_size: int = self._setting_dict.get(
+            "spectrogram_fft_size", 512
+        )
+        if (
+            self._setting_dict.get("use_respeaker_analysis_pool", True)
+            and Node._analysis_pool is None
+        ):
+            Node._analysis_pool = ChunkAnalysisPool(
+                sampling_rate=self._default_sampling_rate,
+                fft_size=spectrogram_fft_size,
+                max_workers=self._setting_dict.get("respeaker_analysis_workers", 2),
+            )
 
         self._node_data[str(node_id)] = {
-            "buffer": np.array([]),
-            "chunks": [np.array([]) for _ in range(6)],
+            "latency_text": "",
+            "chunks": [np.array([]) for _ in range(7)],
             "chunk_index": -1,
             "display_x_buffer": np.array([]),
             "display_y_buffer": np.array([]),
             "selected_channel": 0,
+            "display_mode": "Waveform",
+            "meter": LevelMeter(
+                num_channels=6,
+                sampling_rate=self._default_sampling_rate,
+                hold_time=self._setting_dict.get("meter_hold_time", 1.0),
+                decay_db_per_sec=self._setting_dict.get("meter_decay_db", 20.0),
+            ),
+            "spectrogram": ScrollingSpectrogram(
+                fft_size=spectrogram_fft_size,
+                num_columns=self._setting_dict.get("spectrogram_columns", 160),
+            ),
+            "analysis_index": -1,  # 読み出し済みの解析結果のチャンクインデックス
+            "use_doa_estimate": False,  # DOA推定を出力するか
+            "doa_estimate": None,  # SRP-PHATによるDOA推定（度）
+            "aec": None,  # ソフトウェアAEC（無効時はNone）
+            "output_mode": "Chunk",
+            "frame_length": frame_length,
+            "hop_size": hop_size,
+            "frame_next_end": None,  # 次フレームの終端（累積サンプル位置）
+            "frames": np.zeros((0, frame_length), dtype=np.float32),
+            "beam_method": "Beam: Off",
+            "beam_steering": "Fixed",
+            "beam_angles": [0.0],  # DOA追従時はDOA角度からのオフセット
+            "beamformer": None,  # ソフトウェアビームフォーマ（無効時はNone）
+            "beams": np.zeros((0, 0), dtype=np.float32),
             "is_stopped": False,  # 停止処理の実行フラグ
-            "is_master": Node._shared_node_count == 0,  # 最初のノードがマスター
         }
 
+        # 最初のノードがマスター
+        if Node._master_node_id is None:
+            Node._master_node_id = str(node_id)
+
         # 共有ノード数をカウント
         Node._shared_node_count += 1
 
@@ -107,6 +219,11 @@ class Node(DpgNodeABC):
                     dpg.add_text("ReSpeaker v2: Connected", color=(0, 255, 0))
                 else:
                     dpg.add_text("ReSpeaker v2: Not Found", color=(255, 0, 0))
+                # ネゴシエーション後のキャプチャレイテンシ表示
+                dpg.add_text(
+                    "Latency: -",
+                    tag=f"{node_id}:latency_text",
+                )
 
             # チャンネル選択
             with dpg.node_attribute(
@@ -120,6 +237,7 @@ class Node(DpgNodeABC):
                     "Mic #3 (raw)",  # Ch3
                     "Mic #4 (raw)",  # Ch4
                     "Playback Reference",  # Ch5
+                    "Software Beam",  # ソフトウェアビームフォーマ出力（先頭ビーム）
                 ]
                 dpg.add_combo(
                     channel_names,
@@ -129,6 +247,123 @@ class Node(DpgNodeABC):
                     callback=self._on_channel_select,
                 )
 
+            # 表示モード選択（波形 / 6チャンネルレベルメーター）
+            with dpg.node_attribute(
+                tag=f"{node_id}:display_mode_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_combo(
+                    ["Waveform", "Meter", "Spectrogram"],
+                    default_value="Waveform",
+                    width=waveform_w,
+                    tag=f"{node_id}:display_mode",
+                    callback=self._on_display_mode_select,
+                )
+
+            # ソフトウェアAEC（Ch5をリファレンスとしてCh1～Ch4に適用）
+            with dpg.node_attribute(
+                tag=f"{node_id}:aec_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_checkbox(
+                    label="Software AEC (Mic #1-#4)",
+                    default_value=False,
+                    tag=f"{node_id}:use_aec",
+                    callback=self._on_aec_toggle,
+                )
+                dpg.add_text("AEC: -", tag=f"{node_id}:aec_cost")
+
+            # ソフトウェアビームフォーマ（Mic #1～#4、固定方向またはDOA追従）
+            with dpg.node_attribute(
+                tag=f"{node_id}:beam_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_combo(
+                    list(BEAMFORMER_METHODS.keys()),
+                    default_value="Beam: Off",
+                    width=waveform_w,
+                    tag=f"{node_id}:beam_method",
+                    callback=self._on_beam_setting_change,
+                )
+                dpg.add_combo(
+                    ["Fixed", "DOA"],
+                    default_value="Fixed",
+                    width=waveform_w,
+                    tag=f"{node_id}:beam_steering",
+                    callback=self._on_beam_setting_change,
+                )
+                dpg.add_input_text(
+                    label="Angles",
+                    default_value="0",
+                    width=waveform_w - 50,
+                    on_enter=True,
+                    tag=f"{node_id}:beam_angles",
+                    callback=self._on_beam_setting_change,
+                )
+                dpg.add_text("Beam: -", tag=f"{node_id}:beam_cost")
+
+            # SRP-PHATによるDOA推定（Mic #1～#4、有効時のみワーカースレッドで計算）
+            with dpg.node_attribute(
+                tag=f"{node_id}:doa_estimate_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_checkbox(
+                    label="DOA Estimate (SRP-PHAT)",
+                    default_value=False,
+                    tag=f"{node_id}:use_doa_estimate",
+                    callback=self._on_doa_estimate_toggle,
+                )
+                dpg.add_text("DOA: -", tag=f"{node_id}:doa_estimate_text")
+
+            # 出力モード（チャンク / オーバーラップフレーム）
+            with dpg.node_attribute(
+                tag=f"{node_id}:output_mode_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_combo(
+                    ["Chunk", "Frames"],
+                    default_value="Chunk",
+                    width=waveform_w,
+                    tag=f"{node_id}:output_mode",
+                    callback=self._on_frame_setting_change,
+                )
+                dpg.add_input_int(
+                    label="Frame",
+                    default_value=frame_length,
+                    min_value=16,
+                    min_clamped=True,
+                    width=waveform_w - 50,
+                    tag=f"{node_id}:frame_length",
+                    callback=self._on_frame_setting_change,
+                )
+                dpg.add_input_int(
+                    label="Hop",
+                    default_value=hop_size,
+                    min_value=1,
+                    min_clamped=True,
+                    width=waveform_w - 50,
+                    tag=f"{node_id}:hop_size",
+                    callback=self._on_frame_setting_change,
+                )
+
+            # トレース計測の切り替えとChrome trace形式での出力
+            with dpg.node_attribute(
+                tag=f"{node_id}:trace_attr",
+                attribute_type=dpg.mvNode_Attr_Static,
+            ):
+                dpg.add_checkbox(
+                    label="Trace",
+                    default_value=TRACER.enabled,
+                    tag=f"{node_id}:use_trace",
+                    callback=self._on_trace_toggle,
+                )
+                dpg.add_button(
+                    label="Export Trace",
+                    width=waveform_w,
+                    tag=f"{node_id}:export_trace",
+                    callback=self._on_trace_export,
+                )
+
             # プロットエリア
             with dpg.node_attribute(
                 tag=output_tag_list[0][0],
@@ -164,6 +399,18 @@ class Node(DpgNodeABC):
                         tag=f"{node_id}:audio_line_series",
                     )
 
+                # レベルメーター（軽量な矩形描画のみ）
+                self._add_meter_drawlist(node_id, waveform_w, waveform_h)
+
+                # スペクトログラム（テクスチャと画像はSpectrogram表示中のみ作成）
+                dpg.add_drawlist(
+                    width=waveform_w,
+                    height=waveform_h,
+                    show=False,
+                    tag=f"{node_id}:spectrogram_drawlist",
+                )
+                self._spectrogram_size = (waveform_w, waveform_h)
+
             # 処理時間
             if self._use_pref_counter:
                 with dpg.node_attribute(
@@ -177,6 +424,419 @@ class Node(DpgNodeABC):
 
         return tag_node_name
 
+    @classmethod
+    def wait_chunk_ready(cls, timeout: Optional[float] = None) -> bool:
+        """キャプチャコールバックで1チャンク分が揃うまで待機（ストリーム未開始時はFalse）"""
+        return SHARED_ENGINE.wait_chunk_ready(timeout=timeout)
+
+    @classmethod
+    def chunk_ready_fileno(cls) -> Optional[int]:
+        """1チャンク分が揃うと読み出し可能になるファイルディスクリプタ（select用）
+
+        POSIX専用で、Windowsやストリーム未開始時は None（wait_chunk_ready() を使用）。
+        ストリーム停止で無効になり再生毎に変わるため、再生開始の度に取得し直すこと。
+        """
+        return SHARED_ENGINE.chunk_ready_fileno()
+
+    @classmethod
+    def next_chunk_deadline(cls) -> Optional[float]:
+        """次のチャンクが揃う推定時刻（time.perf_counter() 基準、不明時はNone）"""
+        return SHARED_ENGINE.next_chunk_deadline()
+
+    def _add_meter_drawlist(self, node_id: int, width: int, height: int) -> None:
+        """6チャンネル分のメーターバーを描画するドローリストを作成"""
+        label_h = 14
+        bar_area_h = height - label_h * 2
+        bar_pitch = width / 6
+        bar_w = bar_pitch * 0.6
+
+        self._meter_geometry = {
+            "top": float(label_h),
+            "bottom": float(label_h + bar_area_h),
+            "height": float(bar_area_h),
+            "pitch": bar_pitch,
+            "bar_w": bar_w,
+        }
+
+        with dpg.drawlist(
+            width=width,
+            height=height,
+            show=False,
+            tag=f"{node_id}:meter_drawlist",
+        ):
+            for ch in range(6):
+                x0 = bar_pitch * ch + (bar_pitch - bar_w) / 2
+                x1 = x0 + bar_w
+                bottom = label_h + bar_area_h
+
+                # 背景枠
+                dpg.draw_rectangle(
+                    (x0, label_h),
+                    (x1, bottom),
+                    color=(80, 80, 80),
+                    fill=(30, 30, 30),
+                )
+                # ピーク（薄色）、RMS（濃色）
+                dpg.draw_rectangle(
+                    (x0, bottom),
+                    (x1, bottom),
+                    color=(0, 0, 0, 0),
+                    fill=(90, 160, 90),
+                    tag=f"{node_id}:meter_peak_{ch}",
+                )
+                dpg.draw_rectangle(
+                    (x0, bottom),
+                    (x1, bottom),
+                    color=(0, 0, 0, 0),
+                    fill=(0, 220, 0),
+                    tag=f"{node_id}:meter_rms_{ch}",
+                )
+                # ピークホールド
+                dpg.draw_line(
+                    (x0, bottom),
+                    (x1, bottom),
+                    color=(255, 200, 0),
+                    thickness=2,
+                    tag=f"{node_id}:meter_hold_{ch}",
+                )
+                # クリップ数、チャンネル番号
+                dpg.draw_text(
+                    (x0, 0),
+                    "0",
+                    size=12,
+                    color=(200, 200, 200),
+                    tag=f"{node_id}:meter_clip_{ch}",
+                )
+                dpg.draw_text((x0, bottom + 1), f"Ch{ch}", size=12)
+
+    def _draw_meter(self, node_id: str) -> None:
+        """メーターの値に合わせて矩形とテキストを更新"""
+        meter = self._node_data[node_id]["meter"]
+        geometry = self._meter_geometry
+        bottom = geometry["bottom"]
+        bar_h = geometry["height"]
+        floor_db = self._meter_floor_db
+
+        rms_y = bottom - level_to_ratio(meter.rms, floor_db) * bar_h
+        peak_y = bottom - level_to_ratio(meter.peak, floor_db) * bar_h
+        hold_y = bottom - level_to_ratio(meter.peak_hold, floor_db) * bar_h
+
+        for ch in range(6):
+            x0 = (
+                geometry["pitch"] * ch + (geometry["pitch"] - geometry["bar_w"]) / 2
+            )
+            x1 = x0 + geometry["bar_w"]
+
+            dpg.configure_item(
+                f"{node_id}:meter_peak_{ch}",
+                pmin=(x0, float(peak_y[ch])),
+                pmax=(x1, bottom),
+            )
+            dpg.configure_item(
+                f"{node_id}:meter_rms_{ch}",
+                pmin=(x0, float(rms_y[ch])),
+                pmax=(x1, bottom),
+            )
+            dpg.configure_item(
+                f"{node_id}:meter_hold_{ch}",
+                p1=(x0, float(hold_y[ch])),
+                p2=(x1, float(hold_y[ch])),
+            )
+            clip_count = int(meter.clip_count[ch])
+            dpg.configure_item(
+                f"{node_id}:meter_clip_{ch}",
+                text=str(clip_count),
+                color=(255, 60, 60) if clip_count > 0 else (200, 200, 200),
+            )
+
+    def _add_spectrogram_view(self, node_id: str) -> None:
+        """スペクトログラム用テクスチャと、それを2分割して描画する画像を作成
+
+        rawテクスチャは描画フレーム毎にバッファから転送されるため、
+        Spectrogram表示中のノードのみが保持する。
+        """
+        if dpg.does_item_exist(f"{node_id}:spectrogram_texture"):
+            return
+        spectrogram = self._node_data[node_id]["spectrogram"]
+        _, height = self._spectrogram_size
+
+        # 配列をその場で書き換え、全体の再設定は行わない
+        with dpg.texture_registry():
+            dpg.add_raw_texture(
+                width=spectrogram.num_columns,
+                height=spectrogram.num_bins,
+                default_value=spectrogram.texture_data,
+                format=dpg.mvFormat_Float_rgba,
+                tag=f"{node_id}:spectrogram_texture",
+            )
+        for part in ["older", "newer"]:
+            dpg.draw_image(
+                f"{node_id}:spectrogram_texture",
+                (0, 0),
+                (0, height),
+                uv_min=(0.0, 0.0),
+                uv_max=(0.0, 1.0),
+                parent=f"{node_id}:spectrogram_drawlist",
+                tag=f"{node_id}:spectrogram_image_{part}",
+            )
+
+    def _delete_spectrogram_view(self, node_id: str) -> None:
+        """スペクトログラム用の画像とテクスチャを解放（画像を先に削除）"""
+        for part in ["older", "newer"]:
+            if dpg.does_item_exist(f"{node_id}:spectrogram_image_{part}"):
+                dpg.delete_item(f"{node_id}:spectrogram_image_{part}")
+        if dpg.does_item_exist(f"{node_id}:spectrogram_texture"):
+            dpg.delete_item(f"{node_id}:spectrogram_texture")
+
+    def _draw_spectrogram(self, node_id: str) -> None:
+        """書き込み位置に合わせて2つの画像のUV範囲のみ更新（テクスチャは転送し直さない）"""
+        if not dpg.does_item_exist(f"{node_id}:spectrogram_image_older"):
+            return
+        spectrogram = self._node_data[node_id]["spectrogram"]
+        width, height = self._spectrogram_size
+        regions = spectrogram.scroll_regions(width)
+        for part, (x0, x1, u0, u1) in zip(["older", "newer"], regions):
+            dpg.configure_item(
+                f"{node_id}:spectrogram_image_{part}",
+                pmin=(x0, 0),
+                pmax=(x1, height),
+                uv_min=(u0, 0.0),
+                uv_max=(u1, 1.0),
+            )
+
+    def _is_master(self, node_id: str) -> bool:
+        if Node._master_node_id is None:
+            Node._master_node_id = node_id
+        return Node._master_node_id == node_id
+
+    def _update_analysis_request(self, node_id: str) -> None:
+        """表示モード・チャンネル・AEC・DOA推定の設定から、本ノードが使う解析データを登録"""
+        node_data = self._node_data[node_id]
+        # AEC有効時はAEC適用後の信号で計算する必要があるため、プールは使わない
+        use_pool = node_data["aec"] is None
+        levels = use_pool and node_data["display_mode"] == "Meter"
+        spectrum_channel = (
+            node_data["selected_channel"]
+            if use_pool
+            and node_data["display_mode"] == "Spectrogram"
+            and node_data["selected_channel"] < 6
+            else None
+        )
+        Node._analysis_requests[node_id] = (
+            levels,
+            spectrum_channel,
+            node_data["use_doa_estimate"],
+        )
+
+    @staticmethod
+    def _submit_analysis(chunk_index: int, block: np.ndarray) -> None:
+        """全ノードの要求をまとめ、必要な解析データのみをプールへ投入"""
+        requests = Node._analysis_requests.values()
+        Node._analysis_pool.submit(
+            chunk_index,
+            block,
+            levels=any(levels for levels, _, _ in requests),
+            spectrum_channels=[ch for _, ch, _ in requests if ch is not None],
+            doa=any(doa for _, _, doa in requests),
+        )
+
+    def _analysis_results(self, node_id: str) -> List[AnalysisResult]:
+        """前回以降に完了した解析結果を古い順に取り出す"""
+        results = Node._analysis_pool.results_since(
+            self._node_data[node_id]["analysis_index"]
+        )
+        if results:
+            self._node_data[node_id]["analysis_index"] = results[-1].chunk_index
+        return results
+
+    def _set_display_mode(self, node_id: str, display_mode: str) -> None:
+        """波形プロットとメーターの表示を切り替え"""
+        if node_id not in self._node_data:
+            return
+        self._node_data[node_id]["display_mode"] = display_mode
+
+        # スペクトログラム用テクスチャは表示中のみ保持
+        if display_mode == "Spectrogram":
+            self._add_spectrogram_view(node_id)
+        else:
+            self._delete_spectrogram_view(node_id)
+
+        for tag, mode in [
+            ("audio_plot_area", "Waveform"),
+            ("meter_drawlist", "Meter"),
+            ("spectrogram_drawlist", "Spectrogram"),
+        ]:
+            if dpg.does_item_exist(f"{node_id}:{tag}"):
+                dpg.configure_item(f"{node_id}:{tag}", show=display_mode == mode)
+        if display_mode == "Spectrogram":
+            self._draw_spectrogram(node_id)
+
+    def _set_aec_enabled(self, node_id: str, enabled: bool) -> None:
+        """ソフトウェアAECの有効/無効を切り替え（無効化時はフィルタ状態を破棄）"""
+        if node_id not in self._node_data:
+            return
+        if enabled and self._node_data[node_id]["aec"] is None:
+            self._node_data[node_id]["aec"] = EchoCanceller(
+                block_size=self._aec_block_size,
+                num_partitions=self._aec_num_partitions,
+                sampling_rate=self._default_sampling_rate,
+            )
+        elif not enabled:
+            self._node_data[node_id]["aec"] = None
+            dpg_set_value(f"{node_id}:aec_cost", "AEC: -")
+
+    def _set_frame_setting(
+        self,
+        node_id: str,
+        output_mode: str,
+        frame_length: int,
+        hop_size: int,
+    ) -> None:
+        """フレーム出力設定を更新（フレーム位置は次チャンクで再同期）"""
+        if node_id not in self._node_data:
+            return
+        self._node_data[node_id]["output_mode"] = output_mode
+        self._node_data[node_id]["frame_length"] = max(int(frame_length), 16)
+        self._node_data[node_id]["hop_size"] = max(int(hop_size), 1)
+        self._node_data[node_id]["frame_next_end"] = None
+        self._node_data[node_id]["frames"] = np.zeros(
+            (0, self._node_data[node_id]["frame_length"]), dtype=np.float32
+        )
+
+    def _on_frame_setting_change(self, sender, app_data, user_data):
+        """出力モード・フレーム長・ホップ変更時のコールバック"""
+        node_id = sender.split(":")[0]
+        self._set_frame_setting(
+            node_id,
+            dpg.get_value(f"{node_id}:output_mode"),
+            dpg.get_value(f"{node_id}:frame_length"),
+            dpg.get_value(f"{node_id}:hop_size"),
+        )
+
+    def _update_frames(self, node_id: str) -> None:
+        """新しいチャンクで終端を迎えたフレームを、キャプチャリング上のビューとして取得"""
+        node_data = self._node_data[node_id]
+        frame_length = node_data["frame_length"]
+        hop_size = node_data["hop_size"]
+        read_pos = Node._shared_read_pos
+
+        # キャプチャリングに無いチャンネル（ソフトウェアビーム）はフレーム出力対象外
+        if node_data["selected_channel"] >= 6:
+            node_data["frames"] = np.zeros((0, frame_length), dtype=np.float32)
+            return
+
+        # 初回・設定変更時はチャンク先頭からフレームを開始
+        next_end = node_data["frame_next_end"]
+        if next_end is None or next_end <= read_pos - self._chunk_size:
+            next_end = read_pos - self._chunk_size + frame_length
+
+        ring = SHARED_ENGINE.ring
+        if ring is None or next_end > read_pos:
+            node_data["frames"] = np.zeros((0, frame_length), dtype=np.float32)
+            node_data["frame_next_end"] = next_end
+            return
+
+        count = (read_pos - next_end) // hop_size + 1
+        last_end = next_end + (count - 1) * hop_size
+        node_data["frames"] = ring.frames(
+            node_data["selected_channel"],
+            frame_length,
+            hop_size,
+            last_end,
+            count,
+        )
+        node_data["frame_next_end"] = last_end + hop_size
+
+    def _set_beam_setting(
+        self,
+        node_id: str,
+        beam_method: str,
+        beam_steering: str,
+        beam_angles: str,
+    ) -> None:
+        """ビームフォーマ設定を更新（手法変更時のみ状態を作り直す）"""
+        if node_id not in self._node_data:
+            return
+        node_data = self._node_data[node_id]
+
+        try:
+            angles = [float(angle) for angle in beam_angles.split(",") if angle.strip()]
+        except ValueError:
+            angles = node_data["beam_angles"]
+        node_data["beam_angles"] = angles or [0.0]
+        node_data["beam_steering"] = beam_steering
+
+        method = BEAMFORMER_METHODS.get(beam_method)
+        if beam_method != node_data["beam_method"]:
+            node_data["beam_method"] = beam_method
+            node_data["beamformer"] = None
+            if method is not None:
+                node_data["beamformer"] = Beamformer(
+                    hop_size=self._beam_hop_size,
+                    sampling_rate=self._default_sampling_rate,
+                    method=method,
+                )
+            else:
+                dpg_set_value(f"{node_id}:beam_cost", "Beam: -")
+
+    def _on_beam_setting_change(self, sender, app_data, user_data):
+        """ビームフォーマ設定変更時のコールバック"""
+        node_id = sender.split(":")[0]
+        self._set_beam_setting(
+            node_id,
+            dpg.get_value(f"{node_id}:beam_method"),
+            dpg.get_value(f"{node_id}:beam_steering"),
+            dpg.get_value(f"{node_id}:beam_angles"),
+        )
+
+    def _beam_look_angles(self, node_id: str) -> List[float]:
+        """固定方向、またはDOA角度 + オフセットのビーム方向一覧"""
+        node_data = self._node_data[node_id]
+        angles = node_data["beam_angles"]
+        if node_data["beam_steering"] != "DOA":
+            return angles
+
+        # DOAノードの最新値を使用（未取得時はオフセットをそのまま方向とする）
+        doa = DEVICE_STATE.get_doa()
+        if doa is None:
+            return angles
+        return [doa + self._beam_doa_offset + angle for angle in angles]
+
+    def _on_aec_toggle(self, sender, app_data, user_data):
+        """ソフトウェアAEC切り替え時のコールバック"""
+        node_id = sender.split(":")[0]
+        self._set_aec_enabled(node_id, app_data)
+
+    def _set_doa_estimate_enabled(self, node_id: str, enabled: bool) -> None:
+        """DOA推定の有効/無効を切り替え（無効時はワーカースレッドでも計算しない）"""
+        if node_id not in self._node_data:
+            return
+        self._node_data[node_id]["use_doa_estimate"] = enabled
+        if not enabled:
+            self._node_data[node_id]["doa_estimate"] = None
+            dpg_set_value(f"{node_id}:doa_estimate_text", "DOA: -")
+
+    def _on_doa_estimate_toggle(self, sender, app_data, user_data):
+        """DOA推定切り替え時のコールバック"""
+        node_id = sender.split(":")[0]
+        self._set_doa_estimate_enabled(node_id, app_data)
+
+    def _on_trace_toggle(self, sender, app_data, user_data):
+        """トレース計測切り替え時のコールバック"""
+        TRACER.enabled = app_data
+
+    def _on_trace_export(self, sender, app_data, user_data):
+        """トレース出力ボタン押下時のコールバック"""
+        file_name = time.strftime("respeaker_trace_%Y%m%d_%H%M%S.json")
+        path = os.path.join(self._trace_export_dir, file_name)
+        count = TRACER.export_chrome_trace(path)
+        print(f"Exported {count} trace events: {path}")
+
+    def _on_display_mode_select(self, sender, app_data, user_data):
+        """表示モード選択時のコールバック"""
+        node_id = sender.split(":")[0]
+        self._set_display_mode(node_id, app_data)
+
     def _on_channel_select(self, sender, app_data, user_data):
         """チャンネル選択時のコールバック"""
         node_id = sender.split(":")[0]
@@ -189,6 +849,7 @@ class Node(DpgNodeABC):
             "Mic #3 (raw)",  # Ch3
             "Mic #4 (raw)",  # Ch4
             "Playback Reference",  # Ch5
+            "Software Beam",  # ソフトウェアビームフォーマ出力（先頭ビーム）
         ]
         selected_channel = channel_names.index(app_data)
 
@@ -216,71 +877,70 @@ class Node(DpgNodeABC):
         # 計測開始
         if self._use_pref_counter:
             start_time = time.perf_counter()
+        update_trace_start = TRACER.begin()
 
         # 再生に合わせてスクロールし、チャンク取り出しを行う
-        chunks: List[np.ndarray] = [np.array([]) for _ in range(6)]
+        chunks: List[np.ndarray] = [np.array([]) for _ in range(7)]
+        block: np.ndarray = np.zeros((0, 6), dtype=np.float32)
         current_status = player_status_dict.get("current_status", False)
 
         if current_status == "play":
             # 再生開始時にフラグをリセット
             self._node_data[str(node_id)]["is_stopped"] = False
 
-            # 共有マイクストリーム開始
-            if Node._respeaker_sd is None and self._respeaker_input_id is not None:
-                # 共有バッファを初期化
-                Node._respeaker_buffer = np.zeros((0, 6), dtype=np.float32)
-
-                def shared_callback_mic(indata, frames, time_info, status):
-                    if status:
-                        print(status)
-                    # 共有バッファに追加
-                    if len(Node._respeaker_buffer) == 0:
-                        Node._respeaker_buffer = indata.copy()
-                    else:
-                        Node._respeaker_buffer = np.concatenate(
-                            (Node._respeaker_buffer, indata)
-                        )
-
-                Node._respeaker_sd = sd.InputStream(
-                    samplerate=self._default_sampling_rate,
-                    channels=6,
-                    blocksize=self._chunk_size,
+            # 共有キャプチャエンジン開始
+            if not SHARED_ENGINE.is_running:
+                # オーディオ入力IDは共有キャッシュから取得
+                self._respeaker_input_id = DEVICE_PROBE.get().input_id
+            if not SHARED_ENGINE.is_running and self._respeaker_input_id is not None:
+                SHARED_ENGINE.configure(
+                    sampling_rate=self._default_sampling_rate,
+                    chunk_size=self._chunk_size,
+                    latency_mode=self._latency_mode,
+                    blocksize=self._blocksize,
+                    latency=self._latency,
+                    ring_seconds=self._ring_seconds,
                     device=self._respeaker_input_id,
-                    dtype="float32",
-                    callback=shared_callback_mic,
                 )
-                Node._respeaker_sd.start()
+                SHARED_ENGINE.start()
+
+            if self._node_data[str(node_id)]["latency_text"] != (
+                SHARED_ENGINE.latency_text
+            ):
+                self._node_data[str(node_id)]["latency_text"] = (
+                    SHARED_ENGINE.latency_text
+                )
+                dpg_set_value(
+                    f"{node_id}:latency_text", SHARED_ENGINE.latency_text
+                )
+
+            # 本ノードが使う解析データを登録（マスターが投入時に集約）
+            self._update_analysis_request(str(node_id))
 
             # マスターノードがチャンク処理を担当
-            if self._node_data[str(node_id)]["is_master"]:
-                # 個別バッファに共有バッファからコピー
-                if (
-                    Node._respeaker_buffer is not None
-                    and len(Node._respeaker_buffer) >= self._chunk_size
-                ):
-                    buf = self._node_data[node_id]["buffer"]
-                    if len(buf) == 0:
-                        self._node_data[node_id]["buffer"] = (
-                            Node._respeaker_buffer.copy()
-                        )
-                    else:
-                        self._node_data[node_id]["buffer"] = np.concatenate(
-                            (buf, Node._respeaker_buffer)
-                        )
-                    # 共有バッファをクリア
-                    Node._respeaker_buffer = np.zeros((0, 6), dtype=np.float32)
+            if self._is_master(str(node_id)):
+                # キャプチャエンジンからチャンクサイズ分を再構成して取り出し
+                chunk_data = None
+                capture_chunk = SHARED_ENGINE.read_chunk(timeout=0.0)
+                if capture_chunk is not None:
+                    chunk_data = capture_chunk.data
+                    Node._shared_read_pos = SHARED_ENGINE.ring.read_position
 
-                if len(self._node_data[node_id]["buffer"]) >= self._chunk_size:
+                if chunk_data is not None:
                     # チャンク取り出し（6チャンネル分）
-                    chunk_data = self._node_data[node_id]["buffer"][: self._chunk_size]
+                    trace_start = TRACER.begin()
+                    block = chunk_data
                     for ch in range(6):
                         chunks[ch] = chunk_data[:, ch]
                         # 共有チャンクに保存
                         Node._shared_chunks[ch] = chunks[ch].copy()
+                    Node._shared_block = chunk_data
+                    TRACER.end("mic.slice", trace_start)
 
-                    self._node_data[node_id]["buffer"] = self._node_data[node_id][
-                        "buffer"
-                    ][self._chunk_size :]
+                    # いずれかのノードが使う派生データのみワーカースレッドへ投入し、
+                    # 結果は後続の update() で読み出す（エディタスレッドでは計算しない）
+                    if Node._analysis_pool is not None:
+                        self._submit_analysis(capture_chunk.index, chunk_data)
 
                     # チャンクインデックス更新
                     self._node_data[str(node_id)]["chunk_index"] += 1
@@ -290,16 +950,111 @@ class Node(DpgNodeABC):
             else:
                 # スレーブノードは共有チャンクが更新された時のみ処理
                 if Node._shared_chunk_updated:
+                    trace_start = TRACER.begin()
                     for ch in range(6):
                         chunks[ch] = Node._shared_chunks[ch].copy()
                         self._node_data[node_id]["chunks"][ch] = chunks[ch]
+                    block = Node._shared_block
+                    TRACER.end("mic.slice", trace_start)
 
                     # チャンクインデックス更新
                     self._node_data[str(node_id)]["chunk_index"] += 1
 
+            # ソフトウェアAEC（共有ブロックは変更せず、処理結果を本ノードのみで使用）
+            aec = self._node_data[str(node_id)]["aec"]
+            if aec is not None and len(block) > 0:
+                with TRACER.span("mic.aec"):
+                    block = aec.process(block)
+                for ch in aec.mic_channels:
+                    chunks[ch] = block[:, ch]
+                    if not self._is_master(str(node_id)):
+                        self._node_data[node_id]["chunks"][ch] = chunks[ch]
+
+                dpg_set_value(
+                    f"{node_id}:aec_cost",
+                    f"AEC: {aec.last_elapsed_ms:.2f}ms "
+                    f"(RTF {aec.last_realtime_factor:.3f})",
+                )
+
+            # ソフトウェアビームフォーマ（AEC適用後のMic #1～#4を使用）
+            beamformer = self._node_data[str(node_id)]["beamformer"]
+            if beamformer is not None and len(block) > 0:
+                with TRACER.span("mic.beamformer"):
+                    beams = beamformer.process(
+                        block[:, 1:5], self._beam_look_angles(str(node_id))
+                    )
+                self._node_data[str(node_id)]["beams"] = beams
+                chunks[6] = beams[0]
+                self._node_data[node_id]["chunks"][6] = chunks[6]
+
+                dpg_set_value(
+                    f"{node_id}:beam_cost",
+                    f"Beam: {beamformer.last_elapsed_ms:.2f}ms ({len(beams)} beams)",
+                )
+            elif len(block) > 0:
+                chunks[6] = np.zeros(len(block), dtype=np.float32)
+
+            # オーバーラップフレーム（リング上のストライドビュー、AEC適用前の信号）
+            if (
+                len(chunks[0]) > 0
+                and self._node_data[str(node_id)]["output_mode"] == "Frames"
+            ):
+                with TRACER.span("mic.frames"):
+                    self._update_frames(str(node_id))
+
             # プロット更新（チャンクがある場合のみ）
-            if len(chunks[0]) > 0:
+            if len(chunks[0]) > 0 and (
+                self._node_data[str(node_id)]["display_mode"] == "Meter"
+            ):
+                # 6チャンネル分のレベルを1パスで計算し、バーのみ更新
+                # （AEC無効時はワーカースレッドの計算結果を反映するのみ）
+                meter = self._node_data[str(node_id)]["meter"]
+                with TRACER.span("mic.meter"):
+                    if Node._analysis_pool is not None and aec is None:
+                        for result in self._analysis_results(str(node_id)):
+                            if result.levels is not None:
+                                meter.update_levels(*result.levels, result.frames)
+                    else:
+                        meter.update(block)
+                with TRACER.span("mic.draw_meter"):
+                    self._draw_meter(str(node_id))
+
+                # 処理したノード数をカウント
+                Node._processed_node_count += 1
+
+                # 全ノードが処理完了したらフラグをリセット
+                if Node._processed_node_count >= Node._shared_node_count:
+                    Node._shared_chunk_updated = False
+            elif len(chunks[0]) > 0 and (
+                self._node_data[str(node_id)]["display_mode"] == "Spectrogram"
+            ):
+                # 選択チャンネルのスペクトルを1列分だけ書き込み、表示範囲を更新
                 selected_ch = self._node_data[str(node_id)]["selected_channel"]
+                spectrogram = self._node_data[str(node_id)]["spectrogram"]
+                with TRACER.span("mic.spectrogram"):
+                    if (
+                        Node._analysis_pool is not None
+                        and aec is None
+                        and selected_ch < 6
+                    ):
+                        for result in self._analysis_results(str(node_id)):
+                            magnitude = result.spectra[selected_ch]
+                            if magnitude is not None:
+                                spectrogram.push_magnitude(magnitude)
+                    else:
+                        spectrogram.push(chunks[selected_ch])
+                with TRACER.span("mic.draw_spectrogram"):
+                    self._draw_spectrogram(str(node_id))
+
+                # 処理したノード数をカウント
+                Node._processed_node_count += 1
+
+                # 全ノードが処理完了したらフラグをリセット
+                if Node._processed_node_count >= Node._shared_node_count:
+                    Node._shared_chunk_updated = False
+            elif len(chunks[0]) > 0:
+                selected_ch = self._node_data[str(node_id)]["selected_channel"]
+                trace_start = TRACER.begin()
                 temp_display_y_buffer = self._node_data[str(node_id)][
                     "display_y_buffer"
                 ]
@@ -310,14 +1065,16 @@ class Node(DpgNodeABC):
                 self._node_data[str(node_id)]["display_y_buffer"] = (
                     temp_display_y_buffer
                 )
+                TRACER.end("mic.display_roll", trace_start)
 
-                dpg.set_value(
-                    f"{node_id}:audio_line_series",
-                    [
-                        self._node_data[str(node_id)]["display_x_buffer"],
-                        temp_display_y_buffer,
-                    ],
-                )
+                with TRACER.span("mic.set_value"):
+                    dpg.set_value(
+                        f"{node_id}:audio_line_series",
+                        [
+                            self._node_data[str(node_id)]["display_x_buffer"],
+                            temp_display_y_buffer,
+                        ],
+                    )
 
                 # 処理したノード数をカウント
                 Node._processed_node_count += 1
@@ -334,11 +1091,40 @@ class Node(DpgNodeABC):
                 self._node_data[str(node_id)]["is_stopped"] = True
 
                 # バッファ初期化
-                self._node_data[str(node_id)]["buffer"] = np.zeros(
-                    (0, 6), dtype=np.float32
-                )
+                SHARED_ENGINE.clear()
                 self._node_data[str(node_id)]["chunk_index"] = -1
 
+                # メーター初期化
+                self._node_data[str(node_id)]["meter"].reset()
+                if dpg.does_item_exist(f"{node_id}:meter_drawlist"):
+                    self._draw_meter(str(node_id))
+
+                # スペクトログラム初期化
+                self._node_data[str(node_id)]["spectrogram"].reset()
+                self._draw_spectrogram(str(node_id))
+
+                # 解析結果の破棄
+                if Node._analysis_pool is not None:
+                    Node._analysis_pool.clear()
+                self._node_data[str(node_id)]["analysis_index"] = -1
+                self._node_data[str(node_id)]["doa_estimate"] = None
+                dpg_set_value(f"{node_id}:doa_estimate_text", "DOA: -")
+
+                # AECフィルタ状態初期化
+                if self._node_data[str(node_id)]["aec"] is not None:
+                    self._node_data[str(node_id)]["aec"].reset()
+
+                # ビームフォーマ状態初期化
+                if self._node_data[str(node_id)]["beamformer"] is not None:
+                    self._node_data[str(node_id)]["beamformer"].reset()
+
+                # フレーム出力位置初期化
+                self._node_data[str(node_id)]["frame_next_end"] = None
+                self._node_data[str(node_id)]["frames"] = np.zeros(
+                    (0, self._node_data[str(node_id)]["frame_length"]),
+                    dtype=np.float32,
+                )
+
                 # プロットエリア初期化
                 buffer_len: int = int(self._default_sampling_rate * 5)
                 self._node_data[str(node_id)]["display_y_buffer"] = np.zeros(
@@ -356,10 +1142,8 @@ class Node(DpgNodeABC):
                 )
 
             # 最後のノードが停止時のみ共有ストリームを閉じる
-            if Node._shared_node_count == 1 and Node._respeaker_sd is not None:
-                Node._respeaker_sd.close()
-                Node._respeaker_sd = None
-                Node._respeaker_buffer = None
+            if Node._shared_node_count == 1 and SHARED_ENGINE.is_running:
+                SHARED_ENGINE.stop()
 
         # 選択されたチャンネルのチャンクを出力
         selected_ch = self._node_data[str(node_id)]["selected_channel"]
@@ -372,8 +1156,27 @@ class Node(DpgNodeABC):
             "chunk_index": self._node_data[str(node_id)].get("chunk_index", -1),
             "chunk": output_chunk,
         }
+        if (
+            Node._analysis_pool is not None
+            and self._node_data[str(node_id)]["use_doa_estimate"]
+        ):
+            latest = Node._analysis_pool.latest()
+            if latest is not None and latest.doa is not None and (
+                latest.doa != self._node_data[str(node_id)]["doa_estimate"]
+            ):
+                self._node_data[str(node_id)]["doa_estimate"] = latest.doa
+                dpg_set_value(f"{node_id}:doa_estimate_text", f"DOA: {latest.doa}")
+            result_dict["doa_estimate"] = self._node_data[str(node_id)][
+                "doa_estimate"
+            ]
+        if self._node_data[str(node_id)]["beamformer"] is not None:
+            result_dict["beams"] = self._node_data[str(node_id)]["beams"]
+        if self._node_data[str(node_id)]["output_mode"] == "Frames":
+            result_dict["frames"] = self._node_data[str(node_id)]["frames"]
+            result_dict["hop_size"] = self._node_data[str(node_id)]["hop_size"]
 
         # 計測終了
+        TRACER.end("mic.update", update_trace_start)
         if self._use_pref_counter:
             elapsed_time = time.perf_counter() - start_time
             elapsed_time = int(elapsed_time * 1000)
@@ -382,21 +1185,32 @@ class Node(DpgNodeABC):
         return result_dict
 
     def close(self, node_id: str) -> None:
-        # ノードカウントを減らす
-        Node._shared_node_count -= 1
+        # 追加済みのノードのみカウントを減らす（二重closeでカウントがずれないように）
+        if self._node_data.pop(str(node_id), None) is None:
+            return
+        Node._analysis_requests.pop(str(node_id), None)
+        Node._shared_node_count = max(Node._shared_node_count - 1, 0)
+
+        # マスターが閉じられた場合、次に更新したノードがチャンク取り出しを引き継ぐ
+        if Node._master_node_id == str(node_id):
+            Node._master_node_id = None
 
         # 最後のノードが閉じられる場合、共有ストリームも閉じる
-        if Node._shared_node_count <= 0:
-            if Node._respeaker_sd is not None:
-                Node._respeaker_sd.close()
-                Node._respeaker_sd = None
-                Node._respeaker_buffer = None
-                Node._shared_chunks = [np.array([]) for _ in range(6)]
-                Node._shared_chunk_updated = False
-                Node._processed_node_count = 0
-            Node._shared_node_count = 0
-
-        self._node_data[str(node_id)]["buffer"] = np.zeros((0, 6), dtype=np.float32)
+        if Node._shared_node_count == 0:
+            if SHARED_ENGINE.is_running:
+                SHARED_ENGINE.stop()
+            Node._shared_chunks = [np.array([]) for _ in range(6)]
+            Node._shared_block = np.zeros((0, 6), dtype=np.float32)
+            Node._shared_chunk_updated = False
+            Node._processed_node_count = 0
+
+            # 解析用ワーカースレッドを終了
+            if Node._analysis_pool is not None:
+                Node._analysis_pool.shutdown()
+                Node._analysis_pool = None
+
+        # スペクトログラム用テクスチャを解放
+        self._delete_spectrogram_view(str(node_id))
 
     def get_setting_dict(self, node_id: str) -> Dict[str, Any]:
         tag_name_list: List[Any] = get_tag_name_list(
@@ -421,6 +1235,17 @@ class Node(DpgNodeABC):
             "ver": self._ver,
             "pos": pos,
             "selected_channel": selected_channel_name,
+            "display_mode": self._node_data[str(node_id)]["display_mode"],
+            "use_aec": self._node_data[str(node_id)]["aec"] is not None,
+            "use_doa_estimate": self._node_data[str(node_id)]["use_doa_estimate"],
+            "output_mode": self._node_data[str(node_id)]["output_mode"],
+            "frame_length": self._node_data[str(node_id)]["frame_length"],
+            "hop_size": self._node_data[str(node_id)]["hop_size"],
+            "beam_method": self._node_data[str(node_id)]["beam_method"],
+            "beam_steering": self._node_data[str(node_id)]["beam_steering"],
+            "beam_angles": ", ".join(
+                f"{angle:g}" for angle in self._node_data[str(node_id)]["beam_angles"]
+            ),
         }
         return setting_dict
 
@@ -436,6 +1261,7 @@ class Node(DpgNodeABC):
             "Mic #3 (raw)",  # Ch3
             "Mic #4 (raw)",  # Ch4
             "Playback Reference",  # Ch5
+            "Software Beam",  # ソフトウェアビームフォーマ出力（先頭ビーム）
         ]
 
         if selected_channel_name in channel_names:
@@ -460,3 +1286,52 @@ class Node(DpgNodeABC):
 
         if dpg.does_item_exist(channel_combo_tag):
             dpg.set_value(channel_combo_tag, selected_channel_name)
+
+        # 表示モードを復元
+        display_mode = setting_dict.get("display_mode", "Waveform")
+        if display_mode in ["Waveform", "Meter", "Spectrogram"]:
+            self._set_display_mode(str(node_id), display_mode)
+            if dpg.does_item_exist(f"{node_id}:display_mode"):
+                dpg.set_value(f"{node_id}:display_mode", display_mode)
+
+        # ソフトウェアAEC設定を復元
+        use_aec = setting_dict.get("use_aec", False)
+        self._set_aec_enabled(str(node_id), use_aec)
+        if dpg.does_item_exist(f"{node_id}:use_aec"):
+            dpg.set_value(f"{node_id}:use_aec", use_aec)
+
+        # DOA推定設定を復元
+        use_doa_estimate = setting_dict.get("use_doa_estimate", False)
+        self._set_doa_estimate_enabled(str(node_id), use_doa_estimate)
+        if dpg.does_item_exist(f"{node_id}:use_doa_estimate"):
+            dpg.set_value(f"{node_id}:use_doa_estimate", use_doa_estimate)
+
+        # フレーム出力設定を復元
+        output_mode = setting_dict.get("output_mode", "Chunk")
+        frame_length = setting_dict.get(
+            "frame_length", self._node_data[str(node_id)]["frame_length"]
+        )
+        hop_size = setting_dict.get(
+            "hop_size", self._node_data[str(node_id)]["hop_size"]
+        )
+        self._set_frame_setting(str(node_id), output_mode, frame_length, hop_size)
+        for tag, value in [
+            ("output_mode", output_mode),
+            ("frame_length", frame_length),
+            ("hop_size", hop_size),
+        ]:
+            if dpg.does_item_exist(f"{node_id}:{tag}"):
+                dpg.set_value(f"{node_id}:{tag}", value)
+
+        # ビームフォーマ設定を復元
+        beam_method = setting_dict.get("beam_method", "Beam: Off")
+        beam_steering = setting_dict.get("beam_steering", "Fixed")
+        beam_angles = setting_dict.get("beam_angles", "0")
+        self._set_beam_setting(str(node_id), beam_method, beam_steering, beam_angles)
+        for tag, value in [
+            ("beam_method", beam_method),
+            ("beam_steering", beam_steering),
+            ("beam_angles", beam_angles),
+        ]:
+            if dpg.does_item_exist(f"{node_id}:{tag}"):
+                dpg.set_value(f"{node_id}:{tag}", value)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from node.input_node.respeaker_v2.beamformer import SrpPhatDoaEstimator  # type: ignore
+from node.input_node.respeaker_v2.level_meter import compute_levels  # type: ignore
+from node.input_node.respeaker_v2.spectrogram import (  # type: ignore
+    magnitude_spectrum,
+    spectrum_window,
+)
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
+
+
+class AnalysisResult:
+    """1チャンク分の派生データ（レベル、チャンネル毎のスペクトル、DOA推定）
+
+    要求されなかったデータは None のまま。
+    """
+
+    def __init__(self, chunk_index: int, frames: int, num_channels: int) -> None:
+        self.chunk_index = chunk_index
+        self.frames = frames
+        self.levels: Optional[tuple] = None  # compute_levels() の戻り値
+        self.spectra: List[Optional[np.ndarray]] = [None] * num_channels
+        self.doa: Optional[int] = None
+
+
+class ChunkAnalysisPool:
+    """チャンク毎の派生データをワーカースレッドで計算するプール
+
+    submit() は要求されたデータ（レベル / 指定チャンネルのスペクトル / DOA推定）の
+    タスクのみを投入し、エディタスレッドは完了済みの結果を latest() /
+    results_since() で読み出す。NumPyのFFT等はGILを解放するため、
+    データ毎・チャンク毎のタスクが並列に実行される。
+    スペクトルは指定チャンネル分を1タスク（バッチFFT）でまとめて計算する。
+    完了結果はチャンクインデックス順に最大 max_results 件まで保持し、
+    未完了のチャンクが max_pending 件を超える場合は投入を破棄する。
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int = 16000,
+        fft_size: int = 512,
+        num_channels: int = 6,
+        doa_channels: tuple = (1, 2, 3, 4),
+        max_workers: int = 2,
+        max_results: int = 16,
+        max_pending: int = 8,
+    ) -> None:
+        self.num_channels = num_channels
+        self.doa_channels = list(doa_channels)
+        self.max_results = max_results
+        self.max_pending = max_pending
+
+        self._window, self._scale = spectrum_window(fft_size)
+        self._doa_estimator = SrpPhatDoaEstimator(
+            fft_size=fft_size, sampling_rate=sampling_rate
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="respeaker-analysis"
+        )
+        self._lock = threading.Lock()
+        # chunk_index -> [AnalysisResult, 残りタスク数]
+        self._pending: Dict[int, list] = {}
+        self._results: "OrderedDict[int, AnalysisResult]" = OrderedDict()
+        self._generation = 0
+        self.dropped_chunks = 0
+
+    def submit(
+        self,
+        chunk_index: int,
+        block: np.ndarray,
+        levels: bool = False,
+        spectrum_channels: Sequence[int] = (),
+        doa: bool = False,
+    ) -> bool:
+        """(N × C)ブロックの要求されたデータの解析タスクを投入
+
+        要求が無い場合、または混雑時（破棄数を加算）は False を返す。
+        """
+        tasks: List[Callable[..., None]] = []
+        if levels:
+            tasks.append(self._run_levels)
+        if spectrum_channels:
+            channels = sorted(set(spectrum_channels))
+            tasks.append(lambda r, b: self._run_spectra(r, b, channels))
+        if doa:
+            tasks.append(self._run_doa)
+        if not tasks:
+            return False
+
+        with self._lock:
+            if self._executor is None or len(self._pending) >= self.max_pending:
+                self.dropped_chunks += 1
+                return False
+            result = AnalysisResult(chunk_index, len(block), self.num_channels)
+            self._pending[chunk_index] = [result, len(tasks)]
+            generation = self._generation
+            executor = self._executor
+
+        try:
+            for task in tasks:
+                executor.submit(self._run, task, result, block, generation)
+        except RuntimeError:
+            # 投入中に shutdown() された
+            return False
+        return True
+
+    def _run(
+        self,
+        task: Callable[..., None],
+        result: AnalysisResult,
+        block: np.ndarray,
+        generation: int,
+    ) -> None:
+        try:
+            task(result, block)
+        except Exception as e:
+            print(e)
+        finally:
+            self._complete(result, generation)
+
+    def _run_levels(self, result: AnalysisResult, block: np.ndarray) -> None:
+        with TRACER.span("analysis.levels"):
+            result.levels = compute_levels(block)
+
+    def _run_spectra(
+        self,
+        result: AnalysisResult,
+        block: np.ndarray,
+        channels: List[int],
+    ) -> None:
+        with TRACER.span("analysis.spectrum"):
+            spectra = magnitude_spectrum(
+                block[:, channels].T, self._window, self._scale
+            )
+            for channel, spectrum in zip(channels, spectra):
+                result.spectra[channel] = spectrum
+
+    def _run_doa(self, result: AnalysisResult, block: np.ndarray) -> None:
+        with TRACER.span("analysis.doa"):
+            result.doa = self._doa_estimator.estimate(block[:, self.doa_channels])
+
+    def _complete(self, result: AnalysisResult, generation: int) -> None:
+        with self._lock:
+            # clear() 以前に投入されたタスクの結果は捨てる
+            if generation != self._generation:
+                return
+            entry = self._pending.get(result.chunk_index)
+            if entry is None or entry[0] is not result:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+
+            del self._pending[result.chunk_index]
+            self._results[result.chunk_index] = result
+            # 完了順は前後し得るため、最も古いチャンクから破棄する
+            while len(self._results) > self.max_results:
+                del self._results[min(self._results)]
+
+    def latest(self) -> Optional[AnalysisResult]:
+        """完了済みで最も新しいチャンクの結果"""
+        with self._lock:
+            if not self._results:
+                return None
+            return self._results[max(self._results)]
+
+    def results_since(self, chunk_index: int) -> List[AnalysisResult]:
+        """chunk_index より新しい完了済みの結果を古い順に返す"""
+        with self._lock:
+            return sorted(
+                (r for index, r in self._results.items() if index > chunk_index),
+                key=lambda r: r.chunk_index,
+            )
+
+    def clear(self) -> None:
+        """未完了・完了済みの結果を破棄（実行中のタスクの結果も無視する）"""
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._results.clear()
+            self.dropped_chunks = 0
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor: Any = self._executor
+            self._executor = None
+            self._generation += 1
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False)
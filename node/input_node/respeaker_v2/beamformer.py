@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ReSpeaker USB Mic Array v2.0 のマイク配置（Mic #1～#4、単位:m、半径32mmの正方形）
+RESPEAKER_V2_MIC_POSITIONS = np.array(
+    [
+        [-0.032, 0.000],
+        [0.000, -0.032],
+        [0.032, 0.000],
+        [0.000, 0.032],
+    ],
+    dtype=np.float64,
+)
+
+SOUND_SPEED = 343.0
+
+
+def steering_vectors(
+    angles: np.ndarray,
+    frequencies: np.ndarray,
+    mic_positions: np.ndarray = RESPEAKER_V2_MIC_POSITIONS,
+) -> np.ndarray:
+    """方位角 angles（度）から到来する平面波のステアリングベクトル (A, K, M)"""
+    theta = np.deg2rad(np.asarray(angles, dtype=np.float64))
+    directions = np.stack((np.cos(theta), np.sin(theta)), axis=-1)
+    # 音源方向に近いマイクほど早く到達する
+    delays = -(directions @ mic_positions.T) / SOUND_SPEED
+    return np.exp(
+        -2j
+        * np.pi
+        * frequencies[np.newaxis, :, np.newaxis]
+        * delays[:, np.newaxis, :]
+    )
+
+
+class Beamformer:
+    """Mic #1～#4 に対する周波数領域ビームフォーマ（遅延和 / MVDR）
+
+    sqrt-Hann窓・50%オーバーラップのSTFTでチャンク内の全フレーム・全周波数ビンを
+    一括処理し、複数の指向方向のビームを同時に出力する。
+    ステアリングベクトルは角度（1度単位）毎にキャッシュする。
+    """
+
+    def __init__(
+        self,
+        hop_size: int = 256,
+        sampling_rate: int = 16000,
+        method: str = "das",
+        mic_positions: np.ndarray = RESPEAKER_V2_MIC_POSITIONS,
+        covariance_smoothing: float = 0.95,
+        diagonal_loading: float = 1e-2,
+    ) -> None:
+        self.hop_size = hop_size
+        self.fft_size = hop_size * 2
+        self.sampling_rate = sampling_rate
+        self.method = method
+        self.mic_positions = mic_positions
+        self.num_mics = len(mic_positions)
+        self.covariance_smoothing = covariance_smoothing
+        self.diagonal_loading = diagonal_loading
+
+        self._num_bins = self.fft_size // 2 + 1
+        self._frequencies = np.fft.rfftfreq(self.fft_size, 1.0 / sampling_rate)
+        # 周期Hann窓の平方根（分析・合成の両方に適用して完全再構成）
+        self._window = np.sqrt(
+            0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(self.fft_size) / self.fft_size)
+        ).astype(np.float32)
+        self._steering_cache: Dict[int, np.ndarray] = {}
+
+        # 処理コスト計測
+        self.last_elapsed_ms = 0.0
+
+        self.reset()
+
+    def reset(self) -> None:
+        self._input_tail = np.zeros((self.num_mics, self.hop_size), dtype=np.float32)
+        self._output_tail: Optional[np.ndarray] = None
+        self._covariance = np.tile(
+            np.eye(self.num_mics, dtype=np.complex128), (self._num_bins, 1, 1)
+        )
+
+    def steering_vector(self, angle: float) -> np.ndarray:
+        """方位角 angle（度）から到来する平面波のステアリングベクトル (K, M)"""
+        key = int(round(angle)) % 360
+        steering = self._steering_cache.get(key)
+        if steering is None:
+            steering = steering_vectors(
+                np.array([key]), self._frequencies, self.mic_positions
+            )[0]
+            self._steering_cache[key] = steering
+        return steering
+
+    def _weights(self, angles: Sequence[float]) -> np.ndarray:
+        """ビーム毎の重み (B, K, M) を全周波数ビン一括で計算"""
+        steering = np.stack([self.steering_vector(angle) for angle in angles])
+
+        if self.method != "mvdr":
+            return steering / self.num_mics
+
+        # 対角ローディングしたR^-1を全ビン一括で求め、歪み無し制約で正規化
+        loading = (
+            self.diagonal_loading
+            * np.trace(self._covariance, axis1=1, axis2=2).real
+            / self.num_mics
+        )
+        covariance = self._covariance + loading[:, np.newaxis, np.newaxis] * np.eye(
+            self.num_mics
+        )
+        covariance_inv = np.linalg.inv(covariance)
+        numerator = np.einsum("kij,bkj->bki", covariance_inv, steering)
+        denominator = np.einsum("bki,bki->bk", np.conj(steering), numerator)
+        return numerator / denominator[..., np.newaxis]
+
+    def process(self, mics: np.ndarray, angles: Sequence[float]) -> np.ndarray:
+        """mics: (N, M)（N は hop_size の倍数）から (B, N) のビーム出力を返す
+
+        オーバーラップ加算のため、出力は入力に対して hop_size サンプル遅延する。
+        """
+        start_time = time.perf_counter()
+
+        hop_size = self.hop_size
+        signal = np.concatenate((self._input_tail, mics.T), axis=1)
+        self._input_tail = signal[:, -hop_size:].copy()
+
+        # (M, F, fft_size) のフレームを一括でFFT
+        frames = sliding_window_view(signal, self.fft_size, axis=1)[:, ::hop_size]
+        spectrum = np.fft.rfft(frames * self._window, axis=-1)
+
+        # 空間共分散行列を更新（MVDR時のみ）
+        if self.method == "mvdr":
+            frame_covariance = np.einsum(
+                "mfk,nfk->kmn", spectrum, np.conj(spectrum)
+            ) / spectrum.shape[1]
+            self._covariance = (
+                self.covariance_smoothing * self._covariance
+                + (1.0 - self.covariance_smoothing) * frame_covariance
+            )
+
+        weights = self._weights(angles)
+        beam_spectrum = np.einsum("bkm,mfk->bfk", np.conj(weights), spectrum)
+        beam_frames = np.fft.irfft(beam_spectrum, n=self.fft_size, axis=-1)
+        beam_frames *= self._window
+
+        # 50%オーバーラップ加算（前フレーム後半 + 現フレーム前半）
+        num_beams = len(angles)
+        if self._output_tail is None or len(self._output_tail) != num_beams:
+            self._output_tail = np.zeros((num_beams, hop_size), dtype=np.float64)
+        previous_half = np.concatenate(
+            (self._output_tail[:, np.newaxis, :], beam_frames[:, :-1, hop_size:]),
+            axis=1,
+        )
+        output = beam_frames[:, :, :hop_size] + previous_half
+        self._output_tail = beam_frames[:, -1, hop_size:].copy()
+
+        self.last_elapsed_ms = (time.perf_counter() - start_time) * 1000
+        return output.reshape(num_beams, -1).astype(np.float32)
+
+
+class SrpPhatDoaEstimator:
+    """Mic #1～#4 の SRP-PHAT による到来方向推定
+
+    応答パワーをマイクペア毎の相互スペクトル（GCC-PHAT）の和として計算する。
+    探索角度・周波数帯域・ペア毎の位相回転は初期化時に (A, K × P) の行列に
+    まとめて保持し、推定は1回の行列ベクトル積で行う。
+    """
+
+    def __init__(
+        self,
+        fft_size: int = 512,
+        sampling_rate: int = 16000,
+        resolution: int = 5,
+        min_frequency: float = 300.0,
+        max_frequency: float = 4000.0,
+        mic_positions: np.ndarray = RESPEAKER_V2_MIC_POSITIONS,
+    ) -> None:
+        self.fft_size = fft_size
+        self.angles = np.arange(0, 360, resolution)
+
+        frequencies = np.fft.rfftfreq(fft_size, 1.0 / sampling_rate)
+        self._band = (frequencies >= min_frequency) & (frequencies <= max_frequency)
+        steering = steering_vectors(self.angles, frequencies[self._band], mic_positions)
+
+        # |Σ_m conj(d_m) X_m|^2 の交差項 2Re(conj(d_i) d_j X_i conj(X_j)) のみを使う
+        # （自己項はPHAT正規化により角度に依らず一定）
+        self._pair_i, self._pair_j = np.triu_indices(len(mic_positions), k=1)
+        pair_steering = np.conj(steering[..., self._pair_i]) * steering[..., self._pair_j]
+        self._pair_steering = pair_steering.reshape(len(self.angles), -1).astype(
+            np.complex64
+        )
+
+    def estimate(self, mics: np.ndarray) -> Optional[int]:
+        """mics: (N, M) から最も応答パワーの大きい方位角（度）を返す"""
+        num_frames = len(mics) // self.fft_size
+        if num_frames == 0:
+            return None
+
+        # (M, F, fft_size) に分割して一括FFTし、PHAT重み付け
+        frames = mics[: num_frames * self.fft_size].T.reshape(
+            mics.shape[1], num_frames, self.fft_size
+        )
+        spectrum = np.fft.rfft(frames, axis=-1)[..., self._band]
+        spectrum /= np.maximum(np.abs(spectrum), 1e-12)
+
+        # マイクペア毎の相互スペクトル（フレーム平均） (K, P)
+        cross = np.sum(
+            spectrum[self._pair_i] * np.conj(spectrum[self._pair_j]), axis=1
+        ).T
+        power = (self._pair_steering @ cross.reshape(-1).astype(np.complex64)).real
+        return int(self.angles[np.argmax(power)])
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
+
+RESPEAKER_USB_VENDOR_ID = 0x2886
+RESPEAKER_USB_PRODUCT_ID = 0x0018
+
+
+def import_sounddevice() -> Any:
+    """sounddevice（PortAudio初期化を伴う）を必要になった時点でインポート"""
+    with TRACER.span("probe.import_sounddevice"):
+        import sounddevice as sd  # type: ignore
+
+    return sd
+
+
+def import_usb() -> Any:
+    """pyusb（libusbバックエンド探索を伴う）を必要になった時点でインポート"""
+    with TRACER.span("probe.import_usb"):
+        import usb.core  # type: ignore
+        import usb.util  # type: ignore
+
+    return usb
+
+
+class DeviceProbeResult:
+    """ReSpeakerのオーディオ入力ID、USBデバイス、計測時間の組"""
+
+    def __init__(
+        self,
+        input_id: Optional[int],
+        usb_device: Any,
+        timings: Dict[str, float],
+    ) -> None:
+        self.input_id = input_id
+        self.usb_device = usb_device
+        self.timings = timings
+        self.probe_time = time.time()
+
+
+class DeviceProbeCache:
+    """Mic/VAD/DOAノードで共有するデバイス探索結果のキャッシュ
+
+    初回の get() でのみ同期的に探索し、以降はキャッシュを返す。
+    start_background_refresh()（USBハンドルを使うVAD/DOAノードのみ）後は、
+    利用ノードが残っている間のみバックグラウンドでUSBデバイスを定期的に再探索する。
+    pyusb が未インストールの場合はUSBデバイス無しとして扱い、再試行しない。
+    PortAudioのデバイス一覧は初期化時に固定されるため（再初期化は他の
+    入力ストリームを巻き込む）、オーディオ入力IDは再探索しない。
+    """
+
+    def __init__(self, refresh_interval: float = 5.0) -> None:
+        self.refresh_interval = refresh_interval
+
+        self._result: Optional[DeviceProbeResult] = None
+        self._pinned = False
+        self._usb_unavailable = False  # pyusb 未インストール
+        self._lock = threading.Lock()
+        self._refresh_users = 0
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def _probe_input_id(self, timings: Dict[str, float]) -> Optional[int]:
+        try:
+            start_time = time.perf_counter()
+            sd = import_sounddevice()
+            timings["import_sounddevice_ms"] = (time.perf_counter() - start_time) * 1000
+
+            start_time = time.perf_counter()
+            with TRACER.span("probe.query_devices"):
+                devices = sd.query_devices()
+            timings["query_devices_ms"] = (time.perf_counter() - start_time) * 1000
+        except Exception as e:
+            print(f"Failed to query audio devices: {e}")
+            return None
+
+        # デバイスリストからReSpeakerを探す
+        for input_id, device in enumerate(devices):
+            if device["max_input_channels"] >= 6 and "ReSpeaker" in device["name"]:
+                return input_id
+        return None
+
+    def _probe_usb_device(self, timings: Dict[str, float]) -> Any:
+        if self._usb_unavailable:
+            return None
+        try:
+            start_time = time.perf_counter()
+            usb = import_usb()
+            timings["import_usb_ms"] = (time.perf_counter() - start_time) * 1000
+        except ImportError as e:
+            # VAD/DOAを使わない場合は不要なため、一度だけ通知して以降は探索しない
+            self._usb_unavailable = True
+            print(f"pyusb is not available, ReSpeaker VAD/DOA disabled: {e}")
+            return None
+
+        try:
+            start_time = time.perf_counter()
+            with TRACER.span("probe.usb_find"):
+                dev = usb.core.find(
+                    idVendor=RESPEAKER_USB_VENDOR_ID,
+                    idProduct=RESPEAKER_USB_PRODUCT_ID,
+                )
+            timings["usb_find_ms"] = (time.perf_counter() - start_time) * 1000
+        except usb.core.NoBackendError as e:
+            # libusb が無い場合も同様に一度だけ通知
+            self._usb_unavailable = True
+            print(f"libusb backend is not available, ReSpeaker VAD/DOA disabled: {e}")
+            return None
+        except Exception as e:
+            print(f"Failed to initialize ReSpeaker USB device: {e}")
+            return None
+        return dev
+
+    def pin(self, result: DeviceProbeResult) -> None:
+        """探索を行わず、常に result を返すよう固定（ソークテスト等で使用）"""
+        with self._lock:
+            self._result = result
+            self._pinned = True
+
+    def probe(self, include_audio: bool = True) -> DeviceProbeResult:
+        """デバイスを探索してキャッシュを更新
+
+        include_audio=False の場合はUSBデバイスのみ探索し、
+        オーディオ入力IDは前回の結果を引き継ぐ。
+        """
+        with self._lock:
+            if self._pinned and self._result is not None:
+                return self._result
+            previous = self._result
+
+        timings: Dict[str, float] = {}
+        if include_audio or previous is None:
+            input_id = self._probe_input_id(timings)
+        else:
+            input_id = previous.input_id
+        usb_device = self._probe_usb_device(timings)
+
+        with self._lock:
+            # 同じバス/アドレスのデバイスなら既存のハンドルを使い続ける
+            previous = self._result
+            if (
+                previous is not None
+                and previous.usb_device is not None
+                and usb_device is not None
+                and (previous.usb_device.bus, previous.usb_device.address)
+                == (usb_device.bus, usb_device.address)
+            ):
+                usb_device = previous.usb_device
+
+            result = DeviceProbeResult(input_id, usb_device, timings)
+            self._result = result
+        return result
+
+    def get(self) -> DeviceProbeResult:
+        with self._lock:
+            result = self._result
+        if result is not None:
+            return result
+
+        result = self.probe()
+        # 初回探索時のみ、エディタ起動時から先送りできた時間を表示
+        timing_text = ", ".join(
+            f"{name} {elapsed:.1f}ms" for name, elapsed in result.timings.items()
+        )
+        print(f"ReSpeaker v2 device probe (deferred from startup): {timing_text}")
+        return result
+
+    @property
+    def is_refreshing(self) -> bool:
+        return self._refresh_thread is not None
+
+    def _refresh_loop(self, stop_event: threading.Event) -> None:
+        while not stop_event.wait(self.refresh_interval):
+            self.probe(include_audio=False)
+
+    def start_background_refresh(self) -> None:
+        """USBデバイスの定期再探索を開始（利用ノード数を参照カウント）"""
+        with self._refresh_lock:
+            self._refresh_users += 1
+            if self._refresh_thread is not None:
+                return
+            self._stop_event = threading.Event()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop,
+                args=(self._stop_event,),
+                name="respeaker-device-probe",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        """最後の利用ノードが閉じられた時点で再探索スレッドを停止"""
+        with self._refresh_lock:
+            self._refresh_users = max(self._refresh_users - 1, 0)
+            if self._refresh_users > 0 or self._refresh_thread is None:
+                return
+            self._stop_event.set()
+            self._refresh_thread = None
+
+
+class SharedDeviceState:
+    """VAD/DOAノードが読み出した最新値を他ノード（ビームフォーマ等）と共有"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._doa: Optional[int] = None
+        self._doa_time = 0.0
+        self._vad: Optional[int] = None
+        self._vad_time = 0.0
+
+    def set_doa(self, doa: int) -> None:
+        with self._lock:
+            self._doa = doa
+            self._doa_time = time.perf_counter()
+
+    def get_doa(self, max_age: float = 1.0) -> Optional[int]:
+        """max_age 秒以内に更新されたDOA角度（無ければNone）"""
+        with self._lock:
+            if self._doa is None or time.perf_counter() - self._doa_time > max_age:
+                return None
+            return self._doa
+
+    def set_vad(self, vad: int) -> None:
+        with self._lock:
+            self._vad = vad
+            self._vad_time = time.perf_counter()
+
+    def get_vad(self, max_age: float = 1.0) -> Optional[int]:
+        """max_age 秒以内に更新されたVAD状態（無ければNone）"""
+        with self._lock:
+            if self._vad is None or time.perf_counter() - self._vad_time > max_age:
+                return None
+            return self._vad
+
+
+# 3ノード（Mic/VAD/DOA）で共有するデバイス探索キャッシュ、デバイス状態
+DEVICE_PROBE = DeviceProbeCache()
+DEVICE_STATE = SharedDeviceState()
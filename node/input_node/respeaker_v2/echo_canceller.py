@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from typing import Sequence
+
+import numpy as np
+
+
+def fit_block_size(chunk_size: int, preferred: int = 256) -> int:
+    """chunk_size を割り切れる preferred 以下で最大のブロックサイズを返す"""
+    block_size = min(preferred, chunk_size)
+    while block_size > 1 and chunk_size % block_size != 0:
+        block_size -= 1
+    return max(block_size, 1)
+
+
+class EchoCanceller:
+    """Playback Reference を参照信号とする分割ブロック周波数領域適応フィルタ（PBFDAF）
+
+    Overlap-Save 方式で、複数マイクチャンネルを1回のバッチFFTでまとめて処理する。
+    フィルタ係数・参照信号履歴はチャンクを跨いで保持する。
+    """
+
+    def __init__(
+        self,
+        block_size: int = 256,
+        num_partitions: int = 8,
+        mic_channels: Sequence[int] = (1, 2, 3, 4),
+        reference_channel: int = 5,
+        step_size: float = 0.5,
+        power_smoothing: float = 0.9,
+        sampling_rate: int = 16000,
+    ) -> None:
+        self.block_size = block_size
+        self.num_partitions = num_partitions
+        self.mic_channels = list(mic_channels)
+        self.reference_channel = reference_channel
+        self.step_size = step_size
+        self.power_smoothing = power_smoothing
+        self.sampling_rate = sampling_rate
+
+        self._fft_size = block_size * 2
+        self._num_bins = block_size + 1
+        # -60dBFS相当のホワイトノイズ電力を正則化項とする
+        self._regularization = self._fft_size * 1e-6
+
+        # 処理コスト計測
+        self.last_elapsed_ms = 0.0
+        self.last_realtime_factor = 0.0
+
+        self.reset()
+
+    def reset(self) -> None:
+        num_mics = len(self.mic_channels)
+        self._ref_prev = np.zeros(self.block_size, dtype=np.float32)
+        self._x_history = np.zeros(
+            (self.num_partitions, self._num_bins), dtype=np.complex64
+        )
+        self._weights = np.zeros(
+            (num_mics, self.num_partitions, self._num_bins), dtype=np.complex64
+        )
+        self._power = np.zeros(self._num_bins, dtype=np.float32)
+        self._zeros = np.zeros((num_mics, self.block_size), dtype=np.float32)
+
+    def _process_block(self, mic: np.ndarray, ref: np.ndarray) -> np.ndarray:
+        """mic: (C, B)、ref: (B,) を1ブロック処理し、誤差信号 (C, B) を返す"""
+        block_size = self.block_size
+
+        # 参照信号の周波数領域履歴を更新（先頭が最新）
+        x_spec = np.fft.rfft(np.concatenate((self._ref_prev, ref)))
+        self._x_history[1:] = self._x_history[:-1]
+        self._x_history[0] = x_spec
+        self._ref_prev = ref
+
+        # エコー推定（全パーティション・全チャンネルの積和を一括計算）
+        y_spec = np.einsum("cpk,pk->ck", self._weights, self._x_history)
+        y = np.fft.irfft(y_spec, n=self._fft_size, axis=-1)[:, block_size:]
+        error = mic - y
+
+        # 参照信号電力で正規化したNLMS更新
+        # 全パーティションを同じ誤差で更新するため、パーティション数分の
+        # 参照信号電力で正規化する（実効ステップサイズを step_size に保つ）
+        self._power = self.power_smoothing * self._power + (
+            1.0 - self.power_smoothing
+        ) * (np.abs(x_spec) ** 2)
+        e_spec = np.fft.rfft(
+            np.concatenate((self._zeros, error), axis=-1), axis=-1
+        ) / (self.num_partitions * self._power + self._regularization)
+        gradient = (
+            self.step_size
+            * np.conj(self._x_history)[np.newaxis, :, :]
+            * e_spec[:, np.newaxis, :]
+        )
+
+        # 勾配制約（巡回畳み込み成分の除去）
+        gradient_time = np.fft.irfft(gradient, n=self._fft_size, axis=-1)
+        gradient_time[..., block_size:] = 0.0
+        self._weights += np.fft.rfft(gradient_time, axis=-1).astype(np.complex64)
+
+        return error.astype(np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """(N × 6) ブロックのマイクチャンネルからエコーを除去した新しい配列を返す"""
+        start_time = time.perf_counter()
+
+        output = block.copy()
+        mic = block[:, self.mic_channels].T
+        ref = block[:, self.reference_channel]
+
+        for start in range(0, len(block) - self.block_size + 1, self.block_size):
+            end = start + self.block_size
+            output[start:end, self.mic_channels] = self._process_block(
+                mic[:, start:end], ref[start:end]
+            ).T
+
+        elapsed_time = time.perf_counter() - start_time
+        self.last_elapsed_ms = elapsed_time * 1000
+        if len(block) > 0:
+            self.last_realtime_factor = elapsed_time / (
+                len(block) / self.sampling_rate
+            )
+
+        return output
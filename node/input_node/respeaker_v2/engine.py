@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from node.input_node.respeaker_v2.device import (  # type: ignore
+    DEVICE_PROBE,
+    DEVICE_STATE,
+    import_sounddevice,
+)
+from node.input_node.respeaker_v2.ring_buffer import RingBuffer  # type: ignore
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
+from node.input_node.respeaker_v2.tuning import Tuning  # type: ignore
+
+# ハードウェアブロックサイズとPortAudioレイテンシのプリセット
+# blocksize=None は出力チャンクサイズと同じブロックサイズ（従来動作）
+LATENCY_PRESETS: Dict[str, Dict[str, Any]] = {
+    "low_latency": {"blocksize": 128, "latency": "low"},
+    "default": {"blocksize": None, "latency": "high"},
+    "high_throughput": {"blocksize": 4096, "latency": "high"},
+}
+
+
+class CaptureChunk(NamedTuple):
+    """タイムスタンプ付きの多チャンネルチャンク"""
+
+    index: int
+    timestamp: Optional[float]  # 先頭サンプルの推定キャプチャ時刻（time.perf_counter() 基準）
+    data: np.ndarray  # (chunk_size, 6)
+    vad: Optional[int]
+    doa: Optional[int]
+
+
+class CaptureEngine:
+    """Dear PyGui に依存しない ReSpeaker v2 キャプチャエンジン
+
+    入力ストリーム、リングバッファ、VAD/DOAのUSBポーリングを保持し、
+    chunks()（ブロッキングジェネレータ）または async for でチャンクを取り出す。
+    Mic/VAD/DOAノードはこのエンジンの表示用ビューとして動作する。
+
+        engine = CaptureEngine(chunk_size=1024)
+        engine.start()
+        for chunk in engine.chunks():
+            ...
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int = 16000,
+        chunk_size: int = 1024,
+        latency_mode: str = "default",
+        blocksize: Optional[int] = None,
+        latency: Any = None,
+        ring_seconds: float = 2.0,
+        device: Optional[int] = None,
+        poll_interval: float = 0.1,
+        stream_factory: Optional[Callable[..., Any]] = None,
+        tuning_factory: Callable[[Any], Any] = Tuning,
+    ) -> None:
+        self._stream: Any = None
+        self.stream_factory: Optional[Callable[..., Any]] = None
+        self.tuning_factory = tuning_factory
+        self._ring: Optional[RingBuffer] = None
+        self._chunk_index = -1
+        self.latency_text = ""
+
+        # USBポーリング（VAD/DOA）
+        self.poll_interval = poll_interval
+        self.vad: Optional[int] = None
+        self.doa: Optional[int] = None
+        self._polling_users = 0
+        self._polling_thread: Optional[threading.Thread] = None
+        self._polling_stop = threading.Event()
+        self._polling_lock = threading.Lock()
+
+        self.configure(
+            sampling_rate=sampling_rate,
+            chunk_size=chunk_size,
+            latency_mode=latency_mode,
+            blocksize=blocksize,
+            latency=latency,
+            ring_seconds=ring_seconds,
+            device=device,
+            stream_factory=stream_factory,
+        )
+
+    def configure(
+        self,
+        sampling_rate: int = 16000,
+        chunk_size: int = 1024,
+        latency_mode: str = "default",
+        blocksize: Optional[int] = None,
+        latency: Any = None,
+        ring_seconds: float = 2.0,
+        device: Optional[int] = None,
+        stream_factory: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        """ストリーム設定を更新（次回の start() から反映）
+
+        stream_factory=None の場合は現在のファクトリを維持する。
+        """
+        preset = LATENCY_PRESETS.get(latency_mode, LATENCY_PRESETS["default"])
+        self.sampling_rate = sampling_rate
+        self.chunk_size = chunk_size
+        self.blocksize: int = (
+            blocksize if blocksize is not None else preset["blocksize"]
+        ) or chunk_size
+        self.latency = latency if latency is not None else preset["latency"]
+        self.ring_seconds = ring_seconds
+        self.device = device
+        if stream_factory is not None:
+            self.stream_factory = stream_factory
+
+    @property
+    def is_running(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def ring(self) -> Optional[RingBuffer]:
+        return self._ring
+
+    @property
+    def chunk_index(self) -> int:
+        return self._chunk_index
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            print(status)
+        # 共有リングバッファに追加
+        with TRACER.span("mic.callback"):
+            self._ring.write(indata)
+
+    def start(self) -> bool:
+        """入力ストリームを開始（デバイス未検出時は False）"""
+        if self.is_running:
+            return True
+
+        if self.device is None and self.stream_factory is None:
+            self.device = DEVICE_PROBE.get().input_id
+            if self.device is None:
+                return False
+
+        self._ring = RingBuffer(
+            capacity=max(
+                int(self.sampling_rate * self.ring_seconds),
+                self.chunk_size * 2,
+                self.blocksize * 2,
+            ),
+            num_channels=6,
+            sampling_rate=self.sampling_rate,
+            notify_frames=self.chunk_size,
+        )
+        self._chunk_index = -1
+
+        stream_factory = self.stream_factory
+        if stream_factory is None:
+            stream_factory = import_sounddevice().InputStream
+        self._stream = stream_factory(
+            samplerate=self.sampling_rate,
+            channels=6,
+            blocksize=self.blocksize,
+            latency=self.latency,
+            device=self.device,
+            dtype="float32",
+            callback=self._callback,
+        )
+        self._stream.start()
+
+        # 実際にネゴシエーションされたレイテンシ
+        # （PortAudio入力レイテンシ + ブロック1つ分のバッファリング）
+        stream_latency_ms = self._stream.latency * 1000
+        block_ms = self.blocksize / self.sampling_rate * 1000
+        self.latency_text = (
+            f"Latency: {stream_latency_ms + block_ms:.1f}ms (block {self.blocksize})"
+        )
+        return True
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self.latency_text = ""
+
+    def clear(self) -> None:
+        """未読のサンプルを破棄し、チャンクインデックスを初期化"""
+        if self._ring is not None:
+            self._ring.clear()
+        self._chunk_index = -1
+
+    def read_chunk(self, timeout: Optional[float] = 0.0) -> Optional[CaptureChunk]:
+        """1チャンク分を取り出す。timeout=0 は待機無し、None は揃うまで待機"""
+        ring = self._ring
+        if ring is None:
+            return None
+        if timeout != 0.0 and not ring.wait(timeout=timeout):
+            return None
+
+        start_pos = ring.read_position
+        with TRACER.span("mic.ring_read"):
+            data = ring.read(self.chunk_size)
+        if data is None:
+            return None
+
+        self._chunk_index += 1
+        return CaptureChunk(
+            index=self._chunk_index,
+            timestamp=ring.timestamp_of(start_pos),
+            data=data,
+            vad=self.vad,
+            doa=self.doa,
+        )
+
+    def chunks(self, timeout: float = 0.1) -> Iterator[CaptureChunk]:
+        """ストリーム停止まで、チャンクが揃う毎に返すブロッキングジェネレータ"""
+        while self.is_running:
+            chunk = self.read_chunk(timeout=timeout)
+            if chunk is not None:
+                yield chunk
+
+    def __iter__(self) -> Iterator[CaptureChunk]:
+        return self.chunks()
+
+    async def __aiter__(self) -> AsyncIterator[CaptureChunk]:
+        # 待機はスレッドプールで行い、イベントループをブロックしない
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            chunk = await loop.run_in_executor(None, self.read_chunk, 0.1)
+            if chunk is not None:
+                yield chunk
+
+    def wait_chunk_ready(self, timeout: Optional[float] = None) -> bool:
+        ring = self._ring
+        if ring is None:
+            return False
+        return ring.wait(timeout=timeout)
+
+    def chunk_ready_fileno(self) -> Optional[int]:
+        """1チャンク分が揃うと読み出し可能になるファイルディスクリプタ（select用）
+
+        POSIX専用で、Windowsや停止中は None（wait_chunk_ready() で待機すること）。
+        ディスクリプタは stop() で閉じられ、start() 毎に作り直されるため、
+        再生開始の度に取得し直す必要がある。
+        """
+        ring = self._ring
+        if ring is None:
+            return None
+        return ring.fileno()
+
+    def next_chunk_deadline(self) -> Optional[float]:
+        ring = self._ring
+        if ring is None:
+            return None
+        return ring.next_ready_time()
+
+    def _polling_loop(self, stop_event: threading.Event) -> None:
+        usb_device = None
+        tuning = None
+        while not stop_event.wait(self.poll_interval):
+            # 共有キャッシュのUSBデバイスが変わった場合のみTuningを作り直す
+            dev = DEVICE_PROBE.get().usb_device
+            if dev is not usb_device:
+                usb_device = dev
+                tuning = self.tuning_factory(dev) if dev else None
+            if tuning is None:
+                continue
+
+            try:
+                self.vad = 1 if tuning.is_voice() else 0
+                self.doa = tuning.direction
+            except Exception:
+                continue
+            DEVICE_STATE.set_vad(self.vad)
+            DEVICE_STATE.set_doa(self.doa)
+
+    def start_polling(self) -> None:
+        """VAD/DOAのUSBポーリングを開始（利用者数を参照カウント）"""
+        with self._polling_lock:
+            self._polling_users += 1
+            if self._polling_thread is not None:
+                return
+            self._polling_stop = threading.Event()
+            self._polling_thread = threading.Thread(
+                target=self._polling_loop,
+                args=(self._polling_stop,),
+                name="respeaker-usb-polling",
+                daemon=True,
+            )
+            self._polling_thread.start()
+
+    def stop_polling(self) -> None:
+        with self._polling_lock:
+            self._polling_users = max(self._polling_users - 1, 0)
+            if self._polling_users > 0 or self._polling_thread is None:
+                return
+            self._polling_stop.set()
+            self._polling_thread = None
+
+
+# Mic/VAD/DOAノードで共有するキャプチャエンジン
+SHARED_ENGINE = CaptureEngine()
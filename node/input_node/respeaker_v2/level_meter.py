@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from typing import Tuple
+
+import numpy as np
+
+
+def compute_levels(
+    block: np.ndarray,
+    clip_threshold: float = 0.999,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(N × C)ブロックから全チャンネルのRMS、ピーク、クリップ数をまとめて計算"""
+    num_channels = block.shape[1]
+    if len(block) == 0:
+        return (
+            np.zeros(num_channels, dtype=np.float32),
+            np.zeros(num_channels, dtype=np.float32),
+            np.zeros(num_channels, dtype=np.int64),
+        )
+
+    abs_block = np.abs(block)
+    peak = abs_block.max(axis=0)
+    clip_count = np.count_nonzero(abs_block >= clip_threshold, axis=0)
+    # チャンネル毎の二乗和をeinsumで一括計算（中間配列を作らない）
+    rms = np.sqrt(np.einsum("ij,ij->j", block, block) / len(block))
+
+    return rms.astype(np.float32), peak.astype(np.float32), clip_count
+
+
+def level_to_ratio(level: np.ndarray, floor_db: float = -60.0) -> np.ndarray:
+    """リニア振幅をdBFSに変換し、floor_db～0dBを0.0～1.0に正規化"""
+    db = 20.0 * np.log10(np.maximum(level, 1e-12))
+    return np.clip((db - floor_db) / -floor_db, 0.0, 1.0)
+
+
+class LevelMeter:
+    """多チャンネルのRMS/ピーク/クリップ数メーター（ピークホールド付き）"""
+
+    def __init__(
+        self,
+        num_channels: int = 6,
+        sampling_rate: int = 16000,
+        clip_threshold: float = 0.999,
+        hold_time: float = 1.0,
+        decay_db_per_sec: float = 20.0,
+    ) -> None:
+        self.num_channels = num_channels
+        self.sampling_rate = sampling_rate
+        self.clip_threshold = clip_threshold
+        self.hold_time = hold_time
+        self.decay_db_per_sec = decay_db_per_sec
+
+        self.reset()
+
+    def reset(self) -> None:
+        self.rms = np.zeros(self.num_channels, dtype=np.float32)
+        self.peak = np.zeros(self.num_channels, dtype=np.float32)
+        self.peak_hold = np.zeros(self.num_channels, dtype=np.float32)
+        self.clip_count = np.zeros(self.num_channels, dtype=np.int64)
+        self._hold_remaining = np.zeros(self.num_channels, dtype=np.float32)
+
+    def update(self, block: np.ndarray) -> None:
+        rms, peak, clip_count = compute_levels(block, self.clip_threshold)
+        self.update_levels(rms, peak, clip_count, len(block))
+
+    def update_levels(
+        self,
+        rms: np.ndarray,
+        peak: np.ndarray,
+        clip_count: np.ndarray,
+        frames: int,
+    ) -> None:
+        """compute_levels() で計算済みの値（ワーカースレッド等）でメーターを更新"""
+        self.rms = rms
+        self.peak = peak
+        self.clip_count += clip_count
+
+        # ホールド時間中は値を保持し、経過後はdB/秒で減衰させる
+        duration = frames / self.sampling_rate
+        decay = 10.0 ** (-self.decay_db_per_sec * duration / 20.0)
+        self._hold_remaining -= duration
+        decayed = np.where(
+            self._hold_remaining > 0.0, self.peak_hold, self.peak_hold * decay
+        )
+
+        refreshed = self.peak >= decayed
+        self._hold_remaining[refreshed] = self.hold_time
+        self.peak_hold = np.maximum(self.peak, decayed).astype(np.float32)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+class RingBuffer:
+    """オーディオコールバックから書き込み、エディタ側でチャンク単位に読み出すリングバッファ
+
+    ハードウェアのブロックサイズと出力チャンクサイズを独立させるため、
+    任意長の書き込みを受け付け、読み出し側で chunk_size 毎に再構成する。
+    容量を超えた場合は古いサンプルから破棄し、破棄数を dropped_samples に記録する。
+
+    未読サンプルが notify_frames 以上になった時点で、条件変数と
+    （fileno() 使用時は）パイプで通知するため、ホスト側はポーリングせずに待機できる。
+
+    内部配列は容量の2倍を確保し、各サンプルを前半・後半の両方に書き込む（ミラーリング）。
+    これにより容量以下の任意区間が常に連続メモリとなり、frames() で
+    オーバーラップするフレームをコピー無しのストライドビューとして返せる。
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        num_channels: int = 6,
+        dtype: Any = np.float32,
+        sampling_rate: Optional[int] = None,
+        notify_frames: int = 0,
+    ) -> None:
+        self.capacity = int(capacity)
+        self.num_channels = num_channels
+        self.sampling_rate = sampling_rate
+        self.notify_frames = notify_frames
+        self._buffer = np.zeros((self.capacity * 2, num_channels), dtype=dtype)
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+
+        # 書き込み/読み出し位置は累積サンプル数で管理
+        self._write_pos = 0
+        self._read_pos = 0
+        self.dropped_samples = 0
+
+        # 次チャンク到着時刻の推定用（time.perf_counter() 基準）
+        self._last_write_time: Optional[float] = None
+        self._last_write_frames = 0
+
+        # select() 用の通知パイプ（fileno() 呼び出し時に作成）
+        self._pipe_read_fd: Optional[int] = None
+        self._pipe_write_fd: Optional[int] = None
+        self._pipe_signaled = False
+        self._closed = False
+
+    def write(self, data: np.ndarray) -> None:
+        frames = len(data)
+        if frames == 0:
+            return
+        if frames > self.capacity:
+            data = data[-self.capacity :]
+            frames = self.capacity
+
+        with self._lock:
+            start = self._write_pos % self.capacity
+            first = min(frames, self.capacity - start)
+            mirror = start + self.capacity
+            self._buffer[start : start + first] = data[:first]
+            self._buffer[mirror : mirror + first] = data[:first]
+            if first < frames:
+                rest = frames - first
+                self._buffer[:rest] = data[first:]
+                self._buffer[self.capacity : self.capacity + rest] = data[first:]
+            self._write_pos += frames
+            self._last_write_time = time.perf_counter()
+            self._last_write_frames = frames
+
+            # オーバーラン時は未読の古いサンプルを破棄
+            overrun = self._write_pos - self._read_pos - self.capacity
+            if overrun > 0:
+                self._read_pos += overrun
+                self.dropped_samples += overrun
+
+            # チャンクが揃ったら待機中のスレッドとパイプに通知
+            if self._write_pos - self._read_pos >= self.notify_frames:
+                self._ready.notify_all()
+                self._signal_pipe()
+
+    def _signal_pipe(self) -> None:
+        if self._pipe_write_fd is None or self._pipe_signaled:
+            return
+        try:
+            os.write(self._pipe_write_fd, b"\x01")
+            self._pipe_signaled = True
+        except BlockingIOError:
+            pass
+
+    def _drain_pipe(self) -> None:
+        if self._pipe_read_fd is None or not self._pipe_signaled:
+            return
+        try:
+            while os.read(self._pipe_read_fd, 64):
+                pass
+        except BlockingIOError:
+            pass
+        self._pipe_signaled = False
+
+    def available(self) -> int:
+        with self._lock:
+            return self._write_pos - self._read_pos
+
+    @property
+    def read_position(self) -> int:
+        """読み出し済みの累積サンプル数"""
+        with self._lock:
+            return self._read_pos
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        """frames サンプル分が揃っていればコピーを返し、不足時は None を返す"""
+        with self._lock:
+            if self._write_pos - self._read_pos < frames:
+                return None
+
+            start = self._read_pos % self.capacity
+            out = self._buffer[start : start + frames].copy()
+            self._read_pos += frames
+
+            if self._write_pos - self._read_pos < self.notify_frames:
+                self._drain_pipe()
+        return out
+
+    def frames(
+        self,
+        channel: int,
+        frame_length: int,
+        hop_size: int,
+        last_end: int,
+        count: int,
+    ) -> np.ndarray:
+        """累積位置 last_end で終わる count 個のフレームを (count, frame_length) の読み取り専用ビューで返す
+
+        フレームは古い順に hop_size ずつずれて並ぶ。ビューはリング内部を直接参照するため、
+        書き込みが容量分進む（該当サンプルが上書きされる）前に使用すること。
+        """
+        span = (count - 1) * hop_size + frame_length
+        first_start = last_end - span
+        with self._lock:
+            if (
+                count <= 0
+                or span > self.capacity
+                or first_start < self._write_pos - self.capacity
+                or last_end > self._write_pos
+            ):
+                return np.zeros((0, frame_length), dtype=self._buffer.dtype)
+
+            start = first_start % self.capacity
+            column = self._buffer[start : start + span, channel]
+            sample_stride = column.strides[0]
+            return as_strided(
+                column,
+                shape=(count, frame_length),
+                strides=(hop_size * sample_stride, sample_stride),
+                writeable=False,
+            )
+
+    def wait(
+        self,
+        frames: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """frames サンプル（省略時は notify_frames）が揃うまで待機し、揃ったか否かを返す"""
+        if frames is None:
+            frames = self.notify_frames
+        with self._ready:
+            return (
+                self._ready.wait_for(
+                    lambda: self._closed
+                    or self._write_pos - self._read_pos >= frames,
+                    timeout,
+                )
+                and not self._closed
+            )
+
+    def fileno(self) -> Optional[int]:
+        """チャンク準備完了時に読み出し可能になるファイルディスクリプタ（select用）
+
+        POSIX専用。Windowsでは select() がパイプを扱えないため None を返す
+        （wait() を使用すること）。close() 後も None を返し、
+        取得済みのディスクリプタは close() で無効になる。
+        """
+        if os.name == "nt":
+            return None
+        with self._lock:
+            if self._closed:
+                return None
+            if self._pipe_read_fd is None:
+                self._pipe_read_fd, self._pipe_write_fd = os.pipe()
+                os.set_blocking(self._pipe_read_fd, False)
+                os.set_blocking(self._pipe_write_fd, False)
+                if self._write_pos - self._read_pos >= self.notify_frames:
+                    self._signal_pipe()
+            return self._pipe_read_fd
+
+    def next_ready_time(self, frames: Optional[int] = None) -> Optional[float]:
+        """frames サンプルが揃う推定時刻（time.perf_counter() 基準）
+
+        直近の書き込みブロック長とサンプリングレートから、不足分を満たす
+        ブロック数を見積もる。書き込み実績が無い場合は None を返す。
+        """
+        if frames is None:
+            frames = self.notify_frames
+        with self._lock:
+            missing = frames - (self._write_pos - self._read_pos)
+            if missing <= 0:
+                return time.perf_counter()
+            if (
+                self._last_write_time is None
+                or not self.sampling_rate
+                or self._last_write_frames == 0
+            ):
+                return None
+
+            blocks = math.ceil(missing / self._last_write_frames)
+            return self._last_write_time + (
+                blocks * self._last_write_frames / self.sampling_rate
+            )
+
+    def timestamp_of(self, position: int) -> Optional[float]:
+        """累積位置 position のサンプルの推定キャプチャ時刻（time.perf_counter() 基準）"""
+        with self._lock:
+            if self._last_write_time is None or not self.sampling_rate:
+                return None
+            return self._last_write_time - (
+                (self._write_pos - position) / self.sampling_rate
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._read_pos = self._write_pos
+            self._drain_pipe()
+
+    def close(self) -> None:
+        """通知パイプを閉じ、待機中のスレッドを起こす"""
+        with self._lock:
+            for fd in (self._pipe_read_fd, self._pipe_write_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._pipe_read_fd = None
+            self._pipe_write_fd = None
+            self._pipe_signaled = False
+            self._closed = True
+            self._ready.notify_all()
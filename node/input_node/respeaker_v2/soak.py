@@ -0,0 +1,613 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ReSpeaker v2 の長時間ソークテスト
+
+模擬6チャンネル音声の入力ストリームとUSBデバイスの代替を使い、
+加速した時間でキャプチャエンジン（またはMic/VAD/DOAノード）を動かし続ける。
+RSS、リングバッファの滞留、チャンク欠落、レイテンシ、処理時間を定期的に記録し、
+いずれかが増加傾向（線形回帰の傾き）を示した場合、またはウォームアップ後に
+チャンク欠落が発生した場合は終了コード1で終了する。
+開始前に、合成エコーでソフトウェアAECが収束することも確認する。
+
+    python -m node.input_node.respeaker_v2.soak --hours 4 --speed 20
+    python -m node.input_node.respeaker_v2.soak --mode nodes --hours 1
+    python -m node.input_node.respeaker_v2.soak --mode aec
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from node.input_node.respeaker_v2.analysis_pool import ChunkAnalysisPool  # type: ignore
+from node.input_node.respeaker_v2.device import (  # type: ignore
+    DEVICE_PROBE,
+    DeviceProbeResult,
+)
+from node.input_node.respeaker_v2.echo_canceller import (  # type: ignore
+    EchoCanceller,
+    fit_block_size,
+)
+from node.input_node.respeaker_v2.engine import (  # type: ignore
+    SHARED_ENGINE,
+    CaptureEngine,
+)
+from node.input_node.respeaker_v2.tuning import Tuning  # type: ignore
+
+# Tuning が参照する pyusb の定数の代替
+FAKE_USB = SimpleNamespace(
+    util=SimpleNamespace(
+        CTRL_IN=0x80,
+        CTRL_TYPE_VENDOR=0x40,
+        CTRL_RECIPIENT_DEVICE=0x00,
+        dispose_resources=lambda dev: None,
+    )
+)
+
+# 増加傾向を監視する指標: (表示名, 増加量の絶対許容値を返す関数)
+# チャンク欠落は傾向ではなく、ウォームアップ後の合計で判定する
+METRICS: Dict[str, tuple] = {
+    "rss_kb": ("RSS [KB]", lambda chunk_ms, chunk_size: 4096.0),
+    "backlog_frames": ("Ring backlog [frames]", lambda chunk_ms, chunk_size: chunk_size),
+    "latency_ms": ("Latency [ms]", lambda chunk_ms, chunk_size: chunk_ms),
+    "step_ms": ("Step time [ms]", lambda chunk_ms, chunk_size: 1.0),
+}
+
+
+class FakeInputStream:
+    """sounddevice.InputStream 互換の模擬入力（正弦波 + ノイズの6チャンネル）
+
+    speed 倍に加速した間隔で callback を呼び出す。
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        channels: int = 6,
+        blocksize: int = 1024,
+        latency: Any = None,
+        device: Any = None,
+        dtype: str = "float32",
+        callback: Optional[Callable[..., None]] = None,
+        speed: float = 1.0,
+    ) -> None:
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.latency = blocksize / samplerate
+        self.callback = callback
+        self.speed = speed
+        self.frames_generated = 0
+
+        # 1秒分の信号を事前生成して循環させる
+        t = np.arange(samplerate) / samplerate
+        rng = np.random.default_rng(0)
+        self._signal = np.empty((samplerate, channels), dtype=np.float32)
+        for ch in range(channels):
+            tone = 0.1 * np.sin(2.0 * np.pi * (440.0 + 110.0 * ch) * t)
+            self._signal[:, ch] = tone + 0.01 * rng.standard_normal(samplerate)
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        interval = self.blocksize / self.samplerate / self.speed
+        deadline = time.perf_counter()
+        position = 0
+        while not self._stop_event.is_set():
+            # 締め切り基準で待機し、処理時間によるずれを蓄積させない
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+
+            index = (position + np.arange(self.blocksize)) % self.samplerate
+            self.callback(self._signal[index], self.blocksize, None, None)
+            position = (position + self.blocksize) % self.samplerate
+            self.frames_generated += self.blocksize
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="respeaker-soak-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+
+
+class FakeUsbDevice:
+    """ReSpeakerのUSB制御転送の代替（DOAは回転、VADは周期的にON/OFF）"""
+
+    bus = 0
+    address = 0
+
+    def __init__(self) -> None:
+        self._count = 0
+
+    def ctrl_transfer(self, request_type, request, value, index, length, timeout):
+        self._count += 1
+        if index == 21:  # DOAANGLE
+            result = (self._count * 5) % 360
+        elif index == 19:  # VOICEACTIVITY
+            result = (self._count // 10) % 2
+        else:
+            result = 0
+        return np.array([result, 0], dtype=np.int32).view(np.uint8)
+
+
+def read_rss_kb() -> float:
+    """現在の常駐メモリ（/proc が無い環境では最大常駐メモリ）"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024.0
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+class SoakMonitor:
+    """一定間隔毎に各指標を記録し、終了時に増加傾向を判定"""
+
+    def __init__(
+        self,
+        sampling_rate: int,
+        chunk_size: int,
+        sample_interval: float = 1.0,
+        warmup_ratio: float = 0.1,
+        tolerance: float = 0.2,
+        max_loss_frames: int = 0,
+    ) -> None:
+        self.sampling_rate = sampling_rate
+        self.chunk_size = chunk_size
+        self.sample_interval = sample_interval
+        self.warmup_ratio = warmup_ratio
+        self.tolerance = tolerance
+        self.max_loss_frames = max_loss_frames
+
+        self.samples: Dict[str, List[float]] = {name: [] for name in METRICS}
+        self.loss_frames: List[int] = []  # 記録間隔毎の欠落サンプル数
+        self.audio_hours: List[float] = []
+        self.errors: List[str] = []
+
+        self._last_sample_time = time.perf_counter()
+        self._last_loss = 0
+        self._step_total = 0.0
+        self._step_count = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+
+    def add_step(self, elapsed: float) -> None:
+        """取り出したチャンク1つの処理時間（秒）を記録"""
+        self._step_total += elapsed
+        self._step_count += 1
+
+    def add_latency(self, latency: float) -> None:
+        """取り出したチャンク1つのキャプチャからの経過時間（音声時間の秒）を記録"""
+        self._latency_total += latency
+        self._latency_count += 1
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_sample_time >= self.sample_interval
+
+    def sample(self, ring: Any, audio_frames: int, loss_frames: int) -> None:
+        now = time.perf_counter()
+        self._last_sample_time = now
+        if ring is None:
+            return
+
+        self.audio_hours.append(audio_frames / self.sampling_rate / 3600.0)
+        self.samples["rss_kb"].append(read_rss_kb())
+        self.samples["backlog_frames"].append(float(ring.available()))
+        self.loss_frames.append(loss_frames - self._last_loss)
+        # 記録間隔内に取り出したチャンクの平均（チャンクが無ければ前回値）
+        for name, total, count in [
+            ("latency_ms", self._latency_total, self._latency_count),
+            ("step_ms", self._step_total, self._step_count),
+        ]:
+            if count > 0:
+                value = total / count * 1000
+            else:
+                value = self.samples[name][-1] if self.samples[name] else 0.0
+            self.samples[name].append(value)
+        self._last_loss = loss_frames
+        self._step_total = 0.0
+        self._step_count = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+
+    def report(self) -> bool:
+        """指標毎の増加量と欠落数を表示し、全て許容範囲内なら True"""
+        start = int(len(self.audio_hours) * self.warmup_ratio)
+
+        # 欠落はウォームアップ（少なくとも最初の記録間隔）以降の合計で判定
+        loss_start = max(start, 1)
+        warmup_loss = sum(self.loss_frames[:loss_start])
+        total_loss = sum(self.loss_frames[loss_start:])
+        print(
+            f"Loss after warm-up: {total_loss} frames "
+            f"({total_loss / self.chunk_size:.1f} chunks, "
+            f"{warmup_loss} frames during warm-up)"
+        )
+        if total_loss > self.max_loss_frames:
+            self.errors.append(
+                f"{total_loss} frames lost after warm-up"
+                f" (allowed {self.max_loss_frames})"
+            )
+
+        x = np.array(self.audio_hours[start:])
+        if len(x) < 3 or x[-1] <= x[0]:
+            print("Not enough samples to evaluate trends")
+            for error in self.errors:
+                print(f"ERROR: {error}")
+            return not self.errors
+
+        chunk_ms = self.chunk_size / self.sampling_rate * 1000
+        passed = True
+        print(f"{'metric':<26}{'baseline':>12}{'final':>12}{'growth':>12}  result")
+        for name, (label, abs_tolerance) in METRICS.items():
+            y = np.array(self.samples[name][start:])
+            slope = np.polyfit(x, y, 1)[0]
+            growth = slope * (x[-1] - x[0])
+            head = max(len(y) // 10, 1)
+            baseline = float(np.median(y[:head]))
+            final = float(np.median(y[-head:]))
+            limit = max(
+                abs_tolerance(chunk_ms, self.chunk_size),
+                self.tolerance * abs(baseline),
+            )
+            ok = growth <= limit
+            passed = passed and ok
+            print(
+                f"{label:<26}{baseline:>12.1f}{final:>12.1f}{growth:>12.1f}  "
+                f"{'ok' if ok else 'TRENDING UP'}"
+            )
+
+        for error in self.errors:
+            print(f"ERROR: {error}")
+        return passed and not self.errors
+
+
+def check_echo_canceller(
+    sampling_rate: int = 16000,
+    chunk_size: int = 1024,
+    seconds: int = 5,
+    min_erle_db: float = 20.0,
+) -> List[str]:
+    """合成エコーでソフトウェアAEC（Micノードの既定設定）の収束を確認
+
+    白色ノイズの参照信号を512タップの減衰インパルス応答に通した信号を
+    Mic #1～#4 に与え、1秒毎の出力/入力電力比（dB）を表示する。
+    最終1秒のエコー除去量が min_erle_db 未満、または出力電力が増加し続ける
+    場合はエラーを返す。
+    """
+    rng = np.random.default_rng(0)
+    num_frames = sampling_rate * seconds
+    ref = 0.1 * rng.standard_normal(num_frames)
+    impulse = rng.standard_normal(512) * np.exp(-np.arange(512) / 100.0)
+    impulse /= 2.0 * np.linalg.norm(impulse)
+    echo = np.convolve(ref, impulse)[:num_frames]
+
+    block = np.zeros((num_frames, 6), dtype=np.float32)
+    block[:, 5] = ref
+    for ch in range(1, 5):
+        block[:, ch] = echo + 1e-4 * rng.standard_normal(num_frames)
+
+    aec = EchoCanceller(
+        block_size=fit_block_size(chunk_size, 256),
+        num_partitions=8,
+        sampling_rate=sampling_rate,
+    )
+    output = np.concatenate(
+        [
+            aec.process(block[start : start + chunk_size])
+            for start in range(0, num_frames - chunk_size + 1, chunk_size)
+        ]
+    )
+
+    ratios_db = []
+    for second in range(len(output) // sampling_rate):
+        section = slice(second * sampling_rate, (second + 1) * sampling_rate)
+        ratios_db.append(
+            10.0
+            * np.log10(
+                np.mean(output[section, 1:5] ** 2)
+                / np.mean(block[section, 1:5] ** 2)
+            )
+        )
+    print("AEC output/input [dB]: " + ", ".join(f"{r:+.1f}" for r in ratios_db))
+
+    errors = []
+    if not np.isfinite(ratios_db[-1]) or ratios_db[-1] > -min_erle_db:
+        errors.append(
+            f"AEC did not converge (last second {ratios_db[-1]:+.1f}dB,"
+            f" expected <= {-min_erle_db:.1f}dB)"
+        )
+    elif all(b > a for a, b in zip(ratios_db, ratios_db[1:])):
+        errors.append("AEC output power keeps increasing")
+    return errors
+
+
+def pin_fake_device() -> None:
+    """3ノード共通のデバイス探索結果を模擬デバイスに固定"""
+    DEVICE_PROBE.pin(
+        DeviceProbeResult(input_id=0, usb_device=FakeUsbDevice(), timings={})
+    )
+
+
+def run_engine_soak(args: argparse.Namespace, monitor: SoakMonitor) -> None:
+    """キャプチャエンジン + 解析プールのみを加速実行"""
+    streams: List[FakeInputStream] = []
+
+    def stream_factory(**kwargs: Any) -> FakeInputStream:
+        # タイムスタンプ推定を加速後の実時間に合わせる
+        engine.ring.sampling_rate = args.sampling_rate * args.speed
+        stream = FakeInputStream(speed=args.speed, **kwargs)
+        streams.append(stream)
+        return stream
+
+    engine = CaptureEngine(
+        sampling_rate=args.sampling_rate,
+        chunk_size=args.chunk_size,
+        latency_mode=args.latency_mode,
+        device=0,
+        stream_factory=stream_factory,
+        tuning_factory=lambda dev: Tuning(dev, usb=FAKE_USB),
+        poll_interval=0.1 / args.speed,
+    )
+    pool = ChunkAnalysisPool(
+        sampling_rate=args.sampling_rate, max_workers=args.workers
+    )
+    engine.start()
+    engine.start_polling()
+
+    target_frames = int(args.hours * 3600 * args.sampling_rate)
+    analysis_index = -1
+    try:
+        while streams[-1].frames_generated < target_frames:
+            chunk = engine.read_chunk(timeout=0.1)
+            if chunk is not None:
+                # 取り出したチャンクの処理時間のみ計測（待機時間は含めない）
+                step_start = time.perf_counter()
+                if chunk.timestamp is not None:
+                    monitor.add_latency((step_start - chunk.timestamp) * args.speed)
+
+                # Meter / Spectrogram（Ch0）/ DOA推定を使うノード構成を想定
+                pool.submit(
+                    chunk.index,
+                    chunk.data,
+                    levels=True,
+                    spectrum_channels=(0,),
+                    doa=True,
+                )
+                for result in pool.results_since(analysis_index):
+                    analysis_index = result.chunk_index
+                monitor.add_step(time.perf_counter() - step_start)
+
+            if monitor.due():
+                ring = engine.ring
+                loss = ring.dropped_samples + pool.dropped_chunks * args.chunk_size
+                monitor.sample(ring, streams[-1].frames_generated, loss)
+    finally:
+        engine.stop_polling()
+        engine.stop()
+        pool.shutdown()
+
+
+def run_node_soak(args: argparse.Namespace, monitor: SoakMonitor) -> None:
+    """Mic/VAD/DOAノードを画面無しのDear PyGuiコンテキスト上で加速実行
+
+    churn_interval（音声時間の秒）毎にMicノードを閉じて追加し直し、
+    マスターの引き継ぎと共有ノード数の整合性を確認する。
+    """
+    import dearpygui.dearpygui as dpg  # type: ignore
+
+    from node.input_node import node_input_respeaker_v2_doa as doa_module
+    from node.input_node import node_input_respeaker_v2_mic as mic_module
+    from node.input_node import node_input_respeaker_v2_vad as vad_module
+
+    streams: List[FakeInputStream] = []
+
+    def stream_factory(**kwargs: Any) -> FakeInputStream:
+        # タイムスタンプ推定を加速後の実時間に合わせる
+        SHARED_ENGINE.ring.sampling_rate = args.sampling_rate * args.speed
+        stream = FakeInputStream(speed=args.speed, **kwargs)
+        streams.append(stream)
+        return stream
+
+    SHARED_ENGINE.configure(
+        sampling_rate=args.sampling_rate,
+        chunk_size=args.chunk_size,
+        latency_mode=args.latency_mode,
+        stream_factory=stream_factory,
+    )
+    SHARED_ENGINE.tuning_factory = lambda dev: Tuning(dev, usb=FAKE_USB)
+    SHARED_ENGINE.poll_interval = 0.1 / args.speed
+
+    setting_dict = {
+        "use_pref_counter": False,
+        "default_sampling_rate": args.sampling_rate,
+        "chunk_size": args.chunk_size,
+        "respeaker_latency_mode": args.latency_mode,
+        "respeaker_analysis_workers": args.workers,
+    }
+    player_status_dict = {"current_status": "play"}
+
+    dpg.create_context()
+    with dpg.window():
+        editor = dpg.add_node_editor()
+
+    next_node_id = 1
+    nodes: List[tuple] = []  # (node, node_id, tag_node_name)
+
+    # 追加するMicノードの表示モードを順に切り替え、解析プールの各データを使わせる
+    mic_settings = [
+        {"display_mode": "Meter"},
+        {"display_mode": "Spectrogram", "use_doa_estimate": True},
+        {"display_mode": "Waveform"},
+    ]
+
+    def add(module: Any) -> None:
+        nonlocal next_node_id
+        node = module.Node()
+        tag_node_name = node.add_node(editor, next_node_id, setting_dict=setting_dict)
+        if module is mic_module:
+            node.set_setting_dict(
+                next_node_id, mic_settings[next_node_id % len(mic_settings)]
+            )
+        nodes.append((node, next_node_id, tag_node_name))
+        next_node_id += 1
+
+    def remove(index: int) -> None:
+        node, node_id, tag_node_name = nodes.pop(index)
+        node.close(str(node_id))
+        if tag_node_name is not None and dpg.does_item_exist(tag_node_name):
+            dpg.delete_item(tag_node_name)
+
+    def mic_indices() -> List[int]:
+        return [
+            i for i, (node, _, _) in enumerate(nodes)
+            if isinstance(node, mic_module.Node)
+        ]
+
+    add(mic_module)
+    add(mic_module)
+    add(vad_module)
+    add(doa_module)
+
+    target_frames = int(args.hours * 3600 * args.sampling_rate)
+    churn_frames = int(args.churn_interval * args.sampling_rate)
+    next_churn = churn_frames
+    update_interval = args.chunk_size / args.sampling_rate / args.speed / 2
+    churn_master = True
+    read_pos = mic_module.Node._shared_read_pos
+    try:
+        while not streams or streams[-1].frames_generated < target_frames:
+            step_start = time.perf_counter()
+            for node, node_id, _ in nodes:
+                node.update(str(node_id), [], player_status_dict, {})
+            step_end = time.perf_counter()
+
+            # マスターがチャンクを取り出した回のみ処理時間と遅延を記録
+            if mic_module.Node._shared_read_pos != read_pos:
+                read_pos = mic_module.Node._shared_read_pos
+                monitor.add_step(step_end - step_start)
+                ring = SHARED_ENGINE.ring
+                timestamp = (
+                    ring.timestamp_of(read_pos - args.chunk_size)
+                    if ring is not None and read_pos >= args.chunk_size
+                    else None
+                )
+                if timestamp is not None:
+                    monitor.add_latency((step_end - timestamp) * args.speed)
+
+            generated = streams[-1].frames_generated if streams else 0
+            if churn_frames > 0 and generated >= next_churn:
+                next_churn += churn_frames
+                # 先頭（マスター）と末尾のMicノードを交互に閉じて追加し直す
+                indices = mic_indices()
+                remove(indices[0] if churn_master else indices[-1])
+                churn_master = not churn_master
+                add(mic_module)
+
+                expected = len(mic_indices())
+                if mic_module.Node._shared_node_count != expected:
+                    monitor.errors.append(
+                        f"_shared_node_count={mic_module.Node._shared_node_count}"
+                        f" (expected {expected})"
+                    )
+
+            if monitor.due() and SHARED_ENGINE.ring is not None:
+                pool = mic_module.Node._analysis_pool
+                loss = SHARED_ENGINE.ring.dropped_samples + (
+                    pool.dropped_chunks * args.chunk_size if pool is not None else 0
+                )
+                monitor.sample(SHARED_ENGINE.ring, generated, loss)
+
+            time.sleep(update_interval)
+    finally:
+        while nodes:
+            remove(0)
+        dpg.destroy_context()
+
+    # 全ノードを閉じた後に共有リソースが残っていないこと
+    if SHARED_ENGINE.is_running:
+        monitor.errors.append("capture engine still running after all nodes closed")
+    if mic_module.Node._analysis_pool is not None:
+        monitor.errors.append("analysis pool still alive after all nodes closed")
+    if DEVICE_PROBE.is_refreshing:
+        monitor.errors.append("device probe refresh still running after close")
+    if mic_module.Node._shared_node_count != 0:
+        monitor.errors.append(
+            f"_shared_node_count={mic_module.Node._shared_node_count} after close"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode", choices=["engine", "nodes", "aec"], default="engine",
+        help="aec: AECの収束確認のみ実行",
+    )
+    parser.add_argument("--hours", type=float, default=1.0, help="音声時間")
+    parser.add_argument("--speed", type=float, default=10.0, help="加速倍率")
+    parser.add_argument("--sampling-rate", type=int, default=16000)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--latency-mode", default="default")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--max-loss-frames", type=int, default=0,
+        help="ウォームアップ後に許容する欠落サンプル数",
+    )
+    parser.add_argument(
+        "--churn-interval", type=float, default=600.0,
+        help="Micノードを追加し直す間隔（音声時間の秒、0で無効）",
+    )
+    args = parser.parse_args(argv)
+
+    pin_fake_device()
+    monitor = SoakMonitor(
+        sampling_rate=args.sampling_rate,
+        chunk_size=args.chunk_size,
+        sample_interval=args.sample_interval,
+        tolerance=args.tolerance,
+        max_loss_frames=args.max_loss_frames,
+    )
+
+    # 合成エコーによるAEC収束確認（ソーク開始前に毎回実行）
+    aec_errors = check_echo_canceller(args.sampling_rate, args.chunk_size)
+    for error in aec_errors:
+        print(f"ERROR: {error}")
+    if args.mode == "aec":
+        return 1 if aec_errors else 0
+    monitor.errors.extend(aec_errors)
+
+    start_time = time.perf_counter()
+    if args.mode == "nodes":
+        run_node_soak(args, monitor)
+    else:
+        run_engine_soak(args, monitor)
+    print(
+        f"Soak ({args.mode}): {args.hours:.2f}h of audio "
+        f"in {time.perf_counter() - start_time:.0f}s"
+    )
+    return 0 if monitor.report() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from typing import List, Tuple
+
+import numpy as np
+
+# inferno 風カラーマップのアンカー（RGB、0.0～1.0）
+_COLORMAP_ANCHORS = np.array(
+    [
+        [0.00, 0.00, 0.02],
+        [0.26, 0.04, 0.41],
+        [0.58, 0.15, 0.40],
+        [0.87, 0.32, 0.23],
+        [0.99, 0.65, 0.04],
+        [0.99, 1.00, 0.64],
+    ],
+    dtype=np.float32,
+)
+
+
+def _build_colormap(levels: int = 256) -> np.ndarray:
+    """(levels, 4) のRGBAルックアップテーブルを作成"""
+    anchor_x = np.linspace(0.0, 1.0, len(_COLORMAP_ANCHORS))
+    x = np.linspace(0.0, 1.0, levels)
+    lut = np.ones((levels, 4), dtype=np.float32)
+    for channel in range(3):
+        lut[:, channel] = np.interp(x, anchor_x, _COLORMAP_ANCHORS[:, channel])
+    return lut
+
+
+def magnitude_spectrum(
+    samples: np.ndarray,
+    window: np.ndarray,
+    scale: float,
+) -> np.ndarray:
+    """最終軸の末尾 len(window) サンプル（不足分はゼロ埋め）の振幅スペクトル
+
+    samples は (N,) または (C, N)。複数チャンネルは1回のバッチFFTで計算する。
+    """
+    fft_size = len(window)
+    num_samples = samples.shape[-1]
+    count = min(num_samples, fft_size)
+    frame = np.zeros(samples.shape[:-1] + (fft_size,), dtype=np.float32)
+    frame[..., fft_size - count :] = samples[..., num_samples - count :]
+    return np.abs(np.fft.rfft(frame * window, axis=-1)) * scale
+
+
+def spectrum_window(fft_size: int) -> Tuple[np.ndarray, float]:
+    """Hann窓と、振幅を正規化する係数"""
+    window = np.hanning(fft_size).astype(np.float32)
+    return window, 2.0 / float(window.sum())
+
+
+class ScrollingSpectrogram:
+    """チャンク毎に1列ずつ書き込む循環テクスチャのスペクトログラム
+
+    テクスチャ（RGBA float）は事前確保し、新しい列のみをその場で書き換える。
+    表示側は write_index を境に2つの領域へ分けて描画することで、
+    既存の列を移動させずにスクロール表示する。
+    """
+
+    def __init__(
+        self,
+        fft_size: int = 512,
+        num_columns: int = 160,
+        floor_db: float = -100.0,
+        ceil_db: float = -10.0,
+    ) -> None:
+        self.fft_size = fft_size
+        self.num_columns = num_columns
+        self.num_bins = fft_size // 2 + 1
+        self.floor_db = floor_db
+        self.ceil_db = ceil_db
+
+        # 窓関数・正規化係数はキャッシュして再利用
+        self._window, self._scale = spectrum_window(fft_size)
+        self._colormap = _build_colormap()
+
+        # (bins, columns, RGBA) の行優先配列。先頭行が最高周波数
+        self.texture_data = np.zeros(
+            self.num_bins * num_columns * 4, dtype=np.float32
+        )
+        self._image = self.texture_data.reshape(self.num_bins, num_columns, 4)
+        self.write_index = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._image[:] = self._colormap[0]
+        self.write_index = 0
+
+    def push(self, samples: np.ndarray) -> int:
+        """末尾 fft_size サンプルのスペクトルを1列書き込み、書き込んだ列番号を返す"""
+        return self.push_magnitude(
+            magnitude_spectrum(samples, self._window, self._scale)
+        )
+
+    def push_magnitude(self, magnitude: np.ndarray) -> int:
+        """計算済みの振幅スペクトル（num_bins 点）を1列書き込む"""
+        db = 20.0 * np.log10(np.maximum(magnitude, 1e-12))
+        level = (db - self.floor_db) / (self.ceil_db - self.floor_db)
+        lut_index = np.clip(level * 255.0, 0, 255).astype(np.intp)
+
+        column = self.write_index
+        self._image[:, column, :] = self._colormap[lut_index[::-1]]
+        self.write_index = (column + 1) % self.num_columns
+        return column
+
+    def scroll_regions(
+        self,
+        width: float,
+    ) -> List[Tuple[float, float, float, float]]:
+        """描画用の (x0, x1, u0, u1) を古い列から順に返す"""
+        split = self.write_index / self.num_columns
+        older_w = width * (1.0 - split)
+        return [
+            (0.0, older_w, split, 1.0),
+            (older_w, width, 0.0, split),
+        ]
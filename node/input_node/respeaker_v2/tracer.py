@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class _NullSpan:
+    """計測無効時に返す何もしないスパン"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._tracer.end(self._name, self._start)
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """処理区間（スパン）を事前確保したリングバッファに記録するトレーサー
+
+    記録は有効時のみ行い、無効時の span() は共有のダミーを返すだけとする。
+    export_chrome_trace() で chrome://tracing / Perfetto 用のJSONを出力する。
+    """
+
+    def __init__(self, capacity: int = 65536, enabled: bool = False) -> None:
+        self.capacity = capacity
+        self.enabled = enabled
+
+        self._name_ids = np.zeros(capacity, dtype=np.int32)
+        self._thread_ids = np.zeros(capacity, dtype=np.int32)
+        self._starts = np.zeros(capacity, dtype=np.int64)
+        self._durations = np.zeros(capacity, dtype=np.int64)
+        self._count = 0
+
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._thread_index: Dict[int, int] = {}
+        self._thread_names: List[str] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name: str) -> Any:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def begin(self) -> int:
+        """with文を使えない区間用。無効時は0を返す"""
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def end(self, name: str, start: int) -> None:
+        if start == 0 or not self.enabled:
+            return
+        end = time.perf_counter_ns()
+
+        with self._lock:
+            name_id = self._name_index.get(name)
+            if name_id is None:
+                name_id = len(self._names)
+                self._name_index[name] = name_id
+                self._names.append(name)
+
+            ident = threading.get_ident()
+            thread_id = self._thread_index.get(ident)
+            if thread_id is None:
+                thread_id = len(self._thread_names)
+                self._thread_index[ident] = thread_id
+                self._thread_names.append(threading.current_thread().name)
+
+            index = self._count % self.capacity
+            self._name_ids[index] = name_id
+            self._thread_ids[index] = thread_id
+            self._starts[index] = start - self._origin
+            self._durations[index] = end - start
+            self._count += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._count = 0
+            self._origin = time.perf_counter_ns()
+
+    def export_chrome_trace(self, path: str) -> int:
+        """記録済みスパンをChrome trace-event形式のJSONで保存し、イベント数を返す
+
+        ロック中は記録順に並べた配列と名前表のコピーのみを行い、
+        イベントの組み立てとJSON出力はロック解放後に行う
+        （オーディオコールバック等の end() を待たせないため）。
+        """
+        with self._lock:
+            count = min(self._count, self.capacity)
+            first = self._count - count
+            order = (first + np.arange(count)) % self.capacity
+            name_ids = self._name_ids[order]
+            thread_ids = self._thread_ids[order]
+            starts = self._starts[order]
+            durations = self._durations[order]
+            names = list(self._names)
+            thread_names = list(self._thread_names)
+
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in enumerate(thread_names)
+        ]
+        for name_id, thread_id, start, duration in zip(
+            name_ids.tolist(),
+            thread_ids.tolist(),
+            (starts / 1000.0).tolist(),
+            (durations / 1000.0).tolist(),
+        ):
+            events.append(
+                {
+                    "name": names[name_id],
+                    "cat": "respeaker",
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "ts": start,
+                    "dur": duration,
+                }
+            )
+
+        with open(path, "w") as fp:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
+
+        return count
+
+
+# 3ノード（Mic/VAD/DOA）で共有するトレーサー
+TRACER = Tracer()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import struct
+
+from node.input_node.respeaker_v2.device import import_usb  # type: ignore
+from node.input_node.respeaker_v2.tracer import TRACER  # type: ignore
+
+
+# ReSpeaker parameter definitions
+PARAMETERS = {
+    'DOAANGLE': (21, 0, 'int', 359, 0, 'ro', 'DOA angle. Current value. Orientation depends on build configuration.'),
+    'VOICEACTIVITY': (19, 32, 'int', 1, 0, 'ro', 'VAD voice activity status.', '0 = false (no voice activity)', '1 = true (voice activity)'),
+}
+
+
+class Tuning:
+    TIMEOUT = 100000
+
+    def __init__(self, dev, usb=None):
+        self.dev = dev
+        self.usb = usb if usb is not None else import_usb()
+
+    def read(self, name):
+        try:
+            data = PARAMETERS[name]
+        except KeyError:
+            return
+
+        id = data[0]
+
+        cmd = 0x80 | data[1]
+        if data[2] == 'int':
+            cmd |= 0x40
+
+        length = 8
+
+        with TRACER.span("usb.ctrl_transfer"):
+            response = self.dev.ctrl_transfer(
+                self.usb.util.CTRL_IN | self.usb.util.CTRL_TYPE_VENDOR | self.usb.util.CTRL_RECIPIENT_DEVICE,
+                0, cmd, id, length, self.TIMEOUT)
+
+        response = struct.unpack(b'ii', response.tobytes())
+
+        if data[2] == 'int':
+            result = response[0]
+        else:
+            result = response[0] * (2.**response[1])
+
+        return result
+
+    @property
+    def direction(self):
+        return self.read('DOAANGLE')
+
+    def is_voice(self):
+        return self.read('VOICEACTIVITY')
+
+    def close(self):
+        self.usb.util.dispose_resources(self.dev)